@@ -0,0 +1,69 @@
+# backend/archive.py
+# Hot/cold appointment storage. Bookings older than ARCHIVE_AFTER_DAYS move
+# from Appointment to ArchivedAppointment in batches, one short transaction
+# each, so /book never waits long on SQLite's write lock. DailyStats rows are
+# left alone, so /admin/stats keeps the full history; /appointments reads the
+# archive only when the requested range reaches back into it.
+#   python -m backend.archive [--days 180] [--batch-size 500]
+import argparse
+import os
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import insert
+from sqlmodel import Session, delete, func, select
+
+from backend.database import create_db_and_tables, engine
+from backend.models import Appointment, ArchivedAppointment
+
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "180"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+
+COLUMNS = ["id", "barber_id", "customer_name", "time_slot", "service_type"]
+
+
+def archive_batch(session: Session, before: datetime, batch_size: int) -> int:
+    # Moves the oldest batch of bookings before `before`; returns how many
+    ids = session.exec(
+        select(Appointment.id).where(Appointment.time_slot < before)
+        .order_by(Appointment.time_slot, Appointment.id).limit(batch_size)
+    ).all()
+    if not ids:
+        return 0
+    rows = select(*(getattr(Appointment, name) for name in COLUMNS)).where(Appointment.id.in_(ids))
+    session.execute(insert(ArchivedAppointment).from_select(COLUMNS, rows))
+    session.execute(delete(Appointment).where(Appointment.id.in_(ids)))
+    session.commit()
+    return len(ids)
+
+
+def archive_appointments(before: datetime, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    moved = 0
+    with Session(engine) as session:
+        while True:
+            count = archive_batch(session, before, batch_size)
+            moved += count
+            if count < batch_size:
+                return moved
+
+
+def archive_cutoff(days: int = ARCHIVE_AFTER_DAYS) -> datetime:
+    return datetime.combine(date.today() - timedelta(days=days), datetime.min.time())
+
+
+def archived_until(session: Session) -> Optional[datetime]:
+    # Newest archived booking (None while the archive is empty). Read per
+    # request rather than cached, since the job usually runs in another process.
+    return session.exec(select(func.max(ArchivedAppointment.time_slot))).one()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move old appointments to the archive table.")
+    parser.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS, help="archive bookings older than this many days")
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE, help="bookings moved per transaction")
+    args = parser.parse_args()
+
+    create_db_and_tables()
+    cutoff = archive_cutoff(args.days)
+    moved = archive_appointments(cutoff, args.batch_size)
+    print(f"✅ Archived {moved} appointments before {cutoff.date()}.")
@@ -0,0 +1,116 @@
+# backend/async_routes.py
+# Async versions of the hot endpoints, used when DB_MODE=async.
+# They're registered ahead of the sync handlers in main.py, so they take
+# over the same paths without holding a threadpool worker per request.
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.exc import IntegrityError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.auth import get_async_current_barber
+from backend.availability import availability_index, booking_interval
+from backend.booking import (
+    parse_time_slot,
+    parse_day,
+    parse_service,
+    visible_slots,
+    conflicts_statement,
+    has_conflict,
+    after_booking,
+    dashboard_stats
+)
+from backend.dashboard import dashboard_counters
+from backend.database import get_async_session
+from backend.holds import slot_holds
+from backend.coherence import CACHE_COHERENCE, change_insert
+from backend.listing import list_appointments, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from backend.models import Appointment, AppointmentRow, Barber
+from backend.services import DEFAULT_SERVICE
+from backend.stats import daily_stats_upsert
+from backend.versions import (
+    not_modified,
+    slots_tag,
+    appointments_tag,
+    SLOTS_CACHE_CONTROL,
+    APPOINTMENTS_CACHE_CONTROL
+)
+
+router = APIRouter()
+
+
+@router.get("/slots")
+async def get_slots(request: Request, response: Response, barber_id: int, date: str, service: str = DEFAULT_SERVICE, session: AsyncSession = Depends(get_async_session)):
+    day = parse_day(date)
+    minutes = parse_service(service).minutes
+    tag = slots_tag(barber_id, day, slot_holds.held_intervals(barber_id, day), minutes)
+    cached = not_modified(request, response, tag, SLOTS_CACHE_CONTROL)
+    if cached:
+        return cached
+    intervals = availability_index.cached_day(barber_id, day)
+    if intervals is None:
+        intervals = await session.run_sync(lambda s: availability_index.day(barber_id, day, s))
+    return visible_slots(barber_id, day, intervals, minutes)
+
+
+@router.post("/book")
+async def book_appointment(barber_id: int, date: str, time: str, name: str, hold_id: Optional[str] = None, service: str = DEFAULT_SERVICE, session: AsyncSession = Depends(get_async_session)):
+    time_slot = parse_time_slot(date, time)
+    details = parse_service(service)
+    if not slot_holds.can_book(barber_id, time_slot, time_slot + timedelta(minutes=details.minutes), hold_id):
+        raise HTTPException(status_code=400, detail="Slot is on hold")
+    cached = availability_index.cached_day(barber_id, time_slot.date())
+    if cached is not None and cached.overlaps(*booking_interval(time_slot, details.minutes)):
+        raise HTTPException(status_code=400, detail="Slot already booked")
+
+    # Same INSERT-then-check order as the sync handler
+    appt = Appointment(barber_id=barber_id, customer_name=name, time_slot=time_slot, service_type=service)
+    try:
+        session.add(appt)
+        await session.flush()
+        conflict = has_conflict((await session.exec(conflicts_statement(appt, details.minutes))).all(), time_slot)
+    except IntegrityError:
+        conflict = True
+    if conflict:
+        await session.rollback()
+        raise HTTPException(status_code=400, detail="Slot already booked")
+    await session.execute(daily_stats_upsert(barber_id, time_slot, details.price))
+    if CACHE_COHERENCE:
+        await session.execute(change_insert("slots", barber_id, time_slot.date()))
+    if hold_id and await session.run_sync(lambda s: slot_holds.delete(hold_id, s)) and CACHE_COHERENCE:
+        await session.execute(change_insert("holds", barber_id))
+    await session.commit()
+
+    after_booking(barber_id, time_slot, service, hold_id)
+    return {"message": "Booking successful"}
+
+
+@router.get("/appointments", response_model=List[AppointmentRow])
+async def get_all_appointments(
+    request: Request,
+    response: Response,
+    barber_id: Optional[int] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    fields: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    format: Optional[str] = None,
+    session: AsyncSession = Depends(get_async_session)
+):
+    cached = not_modified(request, response, appointments_tag(), APPOINTMENTS_CACHE_CONTROL)
+    if cached:
+        return cached
+    return await session.run_sync(lambda s: list_appointments(
+        s, response, barber_id, start_date, end_date, fields, cursor, limit, format
+    ))
+
+
+@router.get("/barber/dashboard-stats")
+async def get_barber_stats(current_barber: Barber = Depends(get_async_current_barber), session: AsyncSession = Depends(get_async_session)):
+    now = datetime.now()
+    summary = dashboard_counters.cached_summary(current_barber.id, now.date(), now)
+    if summary is None:
+        summary = await session.run_sync(lambda s: dashboard_counters.summary(current_barber.id, now.date(), now, s))
+    return dashboard_stats(current_barber, summary)
@@ -1,11 +1,18 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Dict, Optional, Set, Tuple
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from sqlmodel import Session, select
-from backend.database import get_session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from backend.database import get_async_session, get_session, engine
 from backend.models import Barber
 
 # Secret key (should be in env, but hardcoded for now)
@@ -13,15 +20,133 @@ SECRET_KEY = "mysecretkey"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 300
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+# Hash cost per environment (passlib's default is 29000). Hashes made with a
+# different cost are upgraded on the next successful login.
+PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", "29000"))
+
+# Password checks run on a dedicated pool so a login burst can't tie up the
+# request threadpool; beyond workers + queue we answer 429.
+LOGIN_WORKERS = int(os.getenv("LOGIN_WORKERS", "4"))
+LOGIN_QUEUE_SIZE = int(os.getenv("LOGIN_QUEUE_SIZE", "32"))
+
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256"],
+    deprecated="auto",
+    pbkdf2_sha256__default_rounds=PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__min_rounds=PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__max_rounds=PASSWORD_HASH_ROUNDS,
+)
+login_pool = ThreadPoolExecutor(max_workers=LOGIN_WORKERS, thread_name_prefix="login")
+login_slots = threading.BoundedSemaphore(LOGIN_WORKERS + LOGIN_QUEUE_SIZE)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login") # Changed from "token" to "login"
 
+# Validated tokens -> barber snapshot, so polling endpoints skip the user lookup
+TOKEN_CACHE_SIZE = 1024
+TOKEN_CACHE_TTL_SECONDS = 60
+
+class TokenCache:
+    def __init__(self, maxsize: int = TOKEN_CACHE_SIZE, ttl_seconds: int = TOKEN_CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # token -> (snapshot dict, expires_at)
+        self._tokens_by_barber: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tokens_by_barber.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self._entries)}
+
+    def get(self, token: str) -> Optional[Barber]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None or entry[1] <= time.time():
+                if entry is not None:
+                    self._drop(token)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            snapshot = entry[0]
+        # Hand out a fresh, detached copy so handlers can't mutate the cache
+        return Barber(**snapshot)
+
+    def put(self, token: str, barber: Barber, token_expires_at: float):
+        if not self.enabled:
+            return
+        expires_at = min(time.time() + self.ttl_seconds, token_expires_at)
+        with self._lock:
+            self._drop(token)
+            self._entries[token] = (barber.model_dump(), expires_at)
+            self._tokens_by_barber.setdefault(barber.id, set()).add(token)
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def invalidate_barber(self, barber_id: int):
+        # Call whenever role, is_active or is_checked_in changes
+        with self._lock:
+            for token in list(self._tokens_by_barber.get(barber_id, ())):
+                self._drop(token)
+
+    def _drop(self, token: str):
+        entry = self._entries.pop(token, None)
+        if entry is not None:
+            tokens = self._tokens_by_barber.get(entry[0]["id"])
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._tokens_by_barber[entry[0]["id"]]
+
+token_cache = TokenCache()
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+def authenticate_barber(username: str, password: str) -> Optional[Barber]:
+    # Runs on login_pool: lookup, verify and (if the cost changed) rehash
+    with Session(engine) as session:
+        barber = session.exec(select(Barber).where(Barber.username == username)).first()
+        if not barber:
+            return None
+        valid, new_hash = pwd_context.verify_and_update(password, barber.hashed_password)
+        if not valid:
+            return None
+        if new_hash:
+            barber.hashed_password = new_hash
+            session.add(barber)
+            session.commit()
+            session.refresh(barber)
+        return barber
+
+async def run_login(username: str, password: str) -> Optional[Barber]:
+    if not login_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, try again shortly",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        future = login_pool.submit(authenticate_barber, username, password)
+    except BaseException:
+        login_slots.release()
+        raise
+    future.add_done_callback(lambda _: login_slots.release())
+    return await asyncio.wrap_future(future)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -32,24 +157,48 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-async def get_current_barber(token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)):
-    credentials_exception = HTTPException(
+def credentials_error():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def token_subject(token: str) -> Tuple[str, float]:
+    # (username, expiry) of a valid token
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
     except JWTError:
-        raise credentials_exception
-        
-    statement = select(Barber).where(Barber.username == username)
-    barber = session.exec(statement).first()
+        raise credentials_error()
+    username: str = payload.get("sub")
+    if username is None:
+        raise credentials_error()
+    return username, payload["exp"]
+
+async def get_current_barber(token: str = Depends(oauth2_scheme), session: Session = Depends(get_session)):
+    # Note: a cache hit returns a detached Barber; use session.get() to modify it
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
+    username, expires_at = token_subject(token)
+    barber = session.exec(select(Barber).where(Barber.username == username)).first()
+    if barber is None:
+        raise credentials_error()
+    token_cache.put(token, barber, expires_at)
+    return barber
+
+async def get_async_current_barber(token: str = Depends(oauth2_scheme), session: AsyncSession = Depends(get_async_session)):
+    # get_current_barber for the DB_MODE=async routes: the lookup doesn't block the event loop
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
+    username, expires_at = token_subject(token)
+    barber = (await session.exec(select(Barber).where(Barber.username == username))).first()
     if barber is None:
-        raise credentials_exception
+        raise credentials_error()
+    token_cache.put(token, barber, expires_at)
     return barber
 
 async def get_current_admin(current_barber: Barber = Depends(get_current_barber)):
@@ -0,0 +1,258 @@
+# backend/availability.py
+# In-process availability index so /slots doesn't hit the DB on every call.
+#
+# Each (barber_id, date) is a DayIntervals: the open windows from the barber's
+# schedule (backend/schedule.py) and the booked intervals, in minutes since midnight. Services have
+# different lengths, so availability is an interval question ("does
+# [start, start + duration) overlap anything?") rather than a fixed grid.
+import os
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import union_all
+from sqlmodel import Session, select
+
+from backend.models import Appointment, ArchivedAppointment
+from backend.schedule import MINUTES_PER_DAY, BarberSchedule, Interval, shift_schedule
+from backend.services import service_for
+from backend.write_guard import WriteGuard
+
+# (barber, day) entries kept; the least recently used are dropped beyond this
+AVAILABILITY_CACHE_DAYS = int(os.getenv("AVAILABILITY_CACHE_DAYS", "10000"))
+
+# Start times are offered on this grid, plus the first minute of every gap
+# (e.g. 09:15 after a 15 minute beard trim at 09:00)
+SLOT_MINUTES = 30
+
+
+def minute_of_day(time_slot: datetime) -> int:
+    return time_slot.hour * 60 + time_slot.minute
+
+
+def booking_interval(time_slot: datetime, minutes: int) -> Interval:
+    start = minute_of_day(time_slot)
+    return start, min(MINUTES_PER_DAY, start + minutes)
+
+
+def minute_labels(minutes: Iterable[int]) -> List[str]:
+    return [f"{m // 60:02d}:{m % 60:02d}" for m in minutes]
+
+
+def across_archive(build):
+    # build(model) -> select over one appointment table. Archived days keep
+    # their bookings; for recent days the archive side is an index probe that
+    # finds nothing.
+    return union_all(build(Appointment), build(ArchivedAppointment))
+
+
+class DayIntervals:
+    # Never mutated once built: writers swap in a new instance, so readers can
+    # use one outside the index lock.
+    __slots__ = ("open", "starts", "ends", "reach")
+
+    def __init__(self, open: Sequence[Interval] = (), booked: Iterable[Interval] = ()):
+        self.open = tuple(open)
+        booked = sorted(booked)
+        self.starts = tuple(start for start, _ in booked)
+        self.ends = tuple(end for _, end in booked)
+        # reach[i] = latest end among the first i + 1 bookings. Bookings made
+        # through /book never overlap (then reach == ends), but imported data
+        # might; reach keeps both lookups below a bisect either way.
+        self.reach = tuple(accumulate(self.ends, max))
+
+    def booked(self) -> List[Interval]:
+        return list(zip(self.starts, self.ends))
+
+    def with_booking(self, interval: Interval) -> "DayIntervals":
+        return DayIntervals(self.open, self.booked() + [interval])
+
+    def without_booking(self, interval: Interval) -> "DayIntervals":
+        booked = self.booked()
+        if interval in booked:
+            booked.remove(interval)
+        return DayIntervals(self.open, booked)
+
+    def with_open(self, open: Sequence[Interval]) -> "DayIntervals":
+        return DayIntervals(open, self.booked())
+
+    def with_extra(self, busy: Sequence[Interval]) -> "DayIntervals":
+        return DayIntervals(self.open, self.booked() + list(busy))
+
+    def overlaps(self, start: int, end: int) -> bool:
+        # O(log n): the first booking reaching past `start` is the only candidate
+        i = bisect_right(self.reach, start)
+        return i < len(self.starts) and self.starts[i] < end
+
+    def fits(self, start: int, end: int) -> bool:
+        return any(ws <= start and end <= we for ws, we in self.open) and not self.overlaps(start, end)
+
+    def free_starts(self, minutes: int, busy: Sequence[Interval] = ()) -> List[int]:
+        # Every start time where `minutes` fits inside an open window without
+        # touching a booking (or one of the extra `busy` intervals, e.g. holds).
+        # O(log n + k) per window: bisect to the window, then walk its gaps.
+        day = self.with_extra(busy) if busy else self
+        starts, ends, reach = day.starts, day.ends, day.reach
+        result = []
+        for window_start, window_end in self.open:
+            i = bisect_right(reach, window_start)
+            cursor = window_start
+            while cursor + minutes <= window_end:
+                gap_end = min(starts[i], window_end) if i < len(starts) else window_end
+                t = cursor
+                while t + minutes <= gap_end:
+                    result.append(t)
+                    t = (t // SLOT_MINUTES + 1) * SLOT_MINUTES
+                if i == len(starts):
+                    break
+                cursor = max(cursor, ends[i])
+                i += 1
+        return result
+
+
+class AvailabilityIndex(WriteGuard):
+    def __init__(self, maxsize: int = AVAILABILITY_CACHE_DAYS):
+        super().__init__()
+        self.maxsize = maxsize
+        self._days: "OrderedDict[Tuple[int, date], DayIntervals]" = OrderedDict()
+
+    def clear(self):
+        with self._writing():
+            self._days.clear()
+
+    def cached_day(self, barber_id: int, day: date) -> Optional[DayIntervals]:
+        # None when the day isn't indexed yet (callers then use day())
+        with self._lock:
+            return self._get((barber_id, day))
+
+    def day(self, barber_id: int, day: date, session: Session) -> DayIntervals:
+        key = (barber_id, day)
+        with self._lock:
+            entry = self._get(key)
+            if entry is not None:
+                return entry
+            token = self._load_token()
+
+        entry = self._load(barber_id, day, session)
+
+        with self._lock:
+            if self._still_current(token):
+                self._store(key, entry)
+        return entry
+
+    def _get(self, key: Tuple[int, date]) -> Optional[DayIntervals]:
+        # Caller holds the lock
+        entry = self._days.get(key)
+        if entry is not None:
+            self._days.move_to_end(key)
+        return entry
+
+    def _store(self, key: Tuple[int, date], entry: DayIntervals):
+        # Caller holds the lock
+        self._days[key] = entry
+        self._days.move_to_end(key)
+        while len(self._days) > self.maxsize:
+            self._days.popitem(last=False)
+
+    def _load(self, barber_id: int, day: date, session: Session) -> DayIntervals:
+        open = shift_schedule.windows(barber_id, day, session)
+        if not open:
+            return DayIntervals()
+
+        start_of_day = datetime.combine(day, datetime.min.time())
+        appointments = session.exec(across_archive(lambda model: select(model.time_slot, model.service_type).where(
+            model.barber_id == barber_id,
+            model.time_slot >= start_of_day,
+            model.time_slot < start_of_day + timedelta(days=1)
+        ))).all()
+        booked = [booking_interval(time_slot, service_for(service).minutes) for time_slot, service in appointments]
+        return DayIntervals(open, booked)
+
+    def load_range(self, barber_ids: Optional[Iterable[int]], start: date, end: date, session: Session,
+                   store: bool = True) -> Dict[Tuple[int, date], DayIntervals]:
+        # Every (barber, day) in [start, end], using one appointments query for
+        # whatever isn't cached yet (working hours come from shift_schedule).
+        # barber_ids=None means every barber that has a shift or override.
+        # store=False reads cached days but doesn't add new ones (long streams).
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        with self._lock:
+            if barber_ids is not None:
+                barber_ids = sorted(set(barber_ids))
+                entries = {(b_id, day): self._get((b_id, day)) for b_id in barber_ids for day in days}
+                if all(entry is not None for entry in entries.values()):
+                    return entries
+            token = self._load_token()
+
+        schedules = shift_schedule.barbers(session)
+
+        def appt_stmt(model):
+            statement = select(model.barber_id, model.time_slot, model.service_type).where(
+                model.time_slot >= datetime.combine(start, datetime.min.time()),
+                model.time_slot < datetime.combine(end + timedelta(days=1), datetime.min.time())
+            )
+            if barber_ids is not None:
+                statement = statement.where(model.barber_id.in_(barber_ids))
+            return statement
+
+        booked_rows = session.exec(across_archive(appt_stmt)).all()
+        if barber_ids is None:
+            barber_ids = sorted(schedules)
+
+        booked = {}
+        for b_id, time_slot, service in booked_rows:
+            interval = booking_interval(time_slot, service_for(service).minutes)
+            booked.setdefault((b_id, time_slot.date()), []).append(interval)
+
+        grid = {}
+        with self._lock:
+            store = store and self._still_current(token)
+            for b_id in barber_ids:
+                for day in days:
+                    key = (b_id, day)
+                    entry = self._get(key)
+                    if entry is None:
+                        schedule = schedules.get(b_id)
+                        open = schedule.windows(day) if schedule is not None else ()
+                        entry = DayIntervals(open, booked.get(key, ()) if open else ())
+                        if store:
+                            self._store(key, entry)
+                    grid[key] = entry
+        return grid
+
+    def mark_booked(self, barber_id: int, time_slot: datetime, minutes: int):
+        key = (barber_id, time_slot.date())
+        with self._writing():
+            entry = self._days.get(key)
+            if entry is not None and entry.open:
+                self._days[key] = entry.with_booking(booking_interval(time_slot, minutes))
+
+    def mark_free(self, barber_id: int, time_slot: datetime, minutes: int):
+        key = (barber_id, time_slot.date())
+        with self._writing():
+            entry = self._days.get(key)
+            if entry is not None:
+                self._days[key] = entry.without_booking(booking_interval(time_slot, minutes))
+
+    def invalidate_day(self, barber_id: int, day: date):
+        # Changed by another worker process (see backend/coherence.py)
+        with self._writing():
+            self._days.pop((barber_id, day), None)
+
+    def reschedule(self, barber_id: int, schedule: Optional[BarberSchedule]):
+        # The barber's working hours changed; schedule=None (not compiled yet)
+        # drops their cached days
+        with self._writing():
+            for key, entry in list(self._days.items()):
+                if key[0] != barber_id:
+                    continue
+                open = schedule.windows(key[1]) if schedule is not None else None
+                # A day without a shift was cached without its bookings, so it
+                # has to be reloaded rather than patched
+                if open is None or (open and not entry.open):
+                    del self._days[key]
+                elif open != entry.open:
+                    self._days[key] = entry.with_open(open)
+
+availability_index = AvailabilityIndex()
@@ -0,0 +1,132 @@
+# backend/booking.py
+# Booking helpers shared by the sync handlers in main.py and the async ones
+# in async_routes.py, so both paths keep the caches in step.
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlmodel import select
+
+from backend.auth import token_cache
+from backend.availability import across_archive, availability_index, DayIntervals, minute_labels
+from backend.dashboard import dashboard_counters
+from backend.events import event_broker
+from backend.holds import slot_holds
+from backend.schedule import check_hours, hour_windows, parse_hours, shift_schedule
+from backend.services import SERVICES, Service, LONGEST_SERVICE_MINUTES, service_for
+from backend.versions import resource_versions
+from backend.models import Appointment, Barber, ShiftOverride
+
+
+def parse_time_slot(date: str, time: str) -> datetime:
+    try:
+        return datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format")
+
+
+def parse_day(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format")
+
+
+def parse_service(name: str) -> Service:
+    service = SERVICES.get(name)
+    if service is None:
+        raise HTTPException(status_code=400, detail="Unknown service")
+    return service
+
+
+def parse_shift_hours(hours: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    try:
+        check_hours(hours)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return sorted(tuple(pair) for pair in hours)
+
+
+def visible_slots(barber_id: int, day: date, intervals: DayIntervals, minutes: int) -> List[str]:
+    # Start times where the service fits; intervals on hold for another
+    # customer count as busy
+    return minute_labels(intervals.free_starts(minutes, slot_holds.held_intervals(barber_id, day)))
+
+
+def conflicts_statement(appt: Appointment, minutes: int):
+    # The barber's bookings that could overlap [start, start + minutes): they
+    # start before it ends, and less than the longest service before it starts.
+    # Archived bookings count too (the unique index only covers the hot table).
+    return across_archive(lambda model: select(model.time_slot, model.service_type).where(
+        model.barber_id == appt.barber_id,
+        model.time_slot > appt.time_slot - timedelta(minutes=LONGEST_SERVICE_MINUTES),
+        model.time_slot < appt.time_slot + timedelta(minutes=minutes),
+        model.id != appt.id
+    ))
+
+
+def has_conflict(rows: List[Tuple[datetime, str]], start: datetime) -> bool:
+    # rows come from conflicts_statement
+    return any(time_slot + timedelta(minutes=service_for(service).minutes) > start for time_slot, service in rows)
+
+
+def after_booking(barber_id: int, time_slot: datetime, service_type: str, hold_id: Optional[str] = None):
+    # Called once the booking is committed
+    service = service_for(service_type)
+    if hold_id:
+        slot_holds.removed(hold_id)
+    availability_index.mark_booked(barber_id, time_slot, service.minutes)
+    dashboard_counters.add(barber_id, time_slot, service)
+    resource_versions.bump("slots", barber_id, time_slot.date())
+    resource_versions.bump("appointments")
+    event_broker.publish_slot("slot-taken", barber_id, time_slot.date(), time_slot.strftime("%H:%M"), service.minutes)
+
+
+def after_cancellation(barber_id: int, time_slot: datetime, service_type: str):
+    # Called once the cancellation is committed
+    service = service_for(service_type)
+    availability_index.mark_free(barber_id, time_slot, service.minutes)
+    dashboard_counters.remove(barber_id, time_slot, service)
+    resource_versions.bump("slots", barber_id, time_slot.date())
+    resource_versions.bump("appointments")
+    event_broker.publish_slot("slot-freed", barber_id, time_slot.date(), time_slot.strftime("%H:%M"), service.minutes)
+
+
+def after_shift_change(barber_id: int, weekday: int, hours: List[Tuple[int, int]]):
+    # Called once the weekday's shifts are committed
+    schedule = shift_schedule.set_weekly(barber_id, weekday, hour_windows(hours))
+    availability_index.reschedule(barber_id, schedule)
+    resource_versions.bump("shifts", barber_id)
+    event_broker.publish_shift(barber_id, weekday, hours)
+
+
+def after_override_change(override: ShiftOverride, removed: bool = False):
+    # Called once the override (or its deletion) is committed
+    if removed:
+        schedule = shift_schedule.remove_override(override.barber_id, override.id)
+    else:
+        hours = parse_hours(override.hours)
+        schedule = shift_schedule.set_override(override.barber_id, override.id, override.start_date,
+                                               override.end_date, hour_windows(hours))
+    availability_index.reschedule(override.barber_id, schedule)
+    resource_versions.bump("shifts", override.barber_id)
+    event_broker.publish_override(override.barber_id, override.start_date, override.end_date,
+                                  None if removed else hours)
+
+
+def after_barber_change(barber_id: int):
+    # Called once a barber's profile/status change is committed
+    token_cache.invalidate_barber(barber_id)
+    resource_versions.bump("barbers")
+
+
+def dashboard_stats(barber: Barber, summary: dict):
+    return {
+        "customers_served_today": summary["count"],
+        "total_earned_today": summary["earnings"],
+        "queue_duration_minutes": summary["queue_minutes"],
+        "is_checked_in": barber.is_checked_in,
+        "name": barber.name
+    }
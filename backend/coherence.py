@@ -0,0 +1,203 @@
+# backend/coherence.py
+# Keeps the in-memory caches coherent when several worker processes share
+# database.db. Every write also inserts a ChangeLog row, in the same
+# transaction (record_change / change_insert). Before each request a worker
+# polls PRAGMA data_version on a private sqlite3 connection - a few
+# microseconds, and it only moves when another connection committed - and,
+# if it moved, reads the new ChangeLog rows and drops just the affected cache
+# entries. Its own changes were already applied by the write hooks in
+# backend/booking.py, so they are skipped. Both reads wait on SQLite's lock
+# while another worker commits, so they run on a thread of their own rather
+# than on the event loop. If the database stays locked past the timeout the
+# request is served without syncing and the next one retries. Set
+# CACHE_COHERENCE=off for a single worker process: no change log is written
+# or polled then.
+#
+# Slot holds live in their own table and are reloaded per barber like any
+# other change. Changes from other workers are also published to this
+# worker's /events subscribers (slot-changed / shift-changed: the log only
+# says what changed, so clients refetch); while streams are open the log is
+# polled every CHANGE_POLL_SECONDS even when no requests come in.
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import insert
+from sqlmodel import Session
+
+from backend.auth import token_cache
+from backend.availability import availability_index
+from backend.dashboard import dashboard_counters
+from backend.database import engine
+from backend.events import event_broker
+from backend.holds import slot_holds
+from backend.models import ChangeLog
+from backend.schedule import shift_schedule
+from backend.versions import resource_versions
+
+logger = logging.getLogger("backend.coherence")
+
+WORKER_ID = uuid.uuid4().hex[:12]
+# Rows kept when pruning (at startup, then every CHANGELOG_KEEP changes); a
+# worker that falls further behind resets its caches
+CHANGELOG_KEEP = int(os.getenv("CHANGELOG_KEEP", "10000"))
+CACHE_COHERENCE = os.getenv("CACHE_COHERENCE", "on") != "off"
+# Only API requests sync; static files, metrics and SSE streams don't read the caches
+UNSYNCED_PATHS = ("/static/", "/metrics", "/events")
+CHANGE_POLL_SECONDS = float(os.getenv("CHANGE_POLL_SECONDS", "1"))
+
+sync_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="coherence")
+
+
+def change_insert(resource: str, barber_id: Optional[int] = None, day: Optional[date] = None):
+    return insert(ChangeLog).values(origin=WORKER_ID, resource=resource, barber_id=barber_id, day=day)
+
+
+def record_change(session: Session, resource: str, barber_id: Optional[int] = None, day: Optional[date] = None):
+    # Inside the caller's transaction, like stats.record_booking
+    if CACHE_COHERENCE:
+        session.execute(change_insert(resource, barber_id, day))
+
+
+class ChangeFeed:
+    def __init__(self, path: Optional[str]):
+        # path=None (in-memory database) means a single process: nothing to do
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._data_version: Optional[int] = None
+        self._seq = 0
+        self._pruned_seq = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False, isolation_level=None)
+        return self._conn
+
+    def clear(self):
+        # Start from the current end of the log (caches are empty or current)
+        if self.path is None:
+            return
+        with self._lock:
+            conn = self._connect()
+            self._data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+            self._seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM changelog").fetchone()[0]
+            self._pruned_seq = self._seq
+
+    def prune(self, keep: int = CHANGELOG_KEEP):
+        if self.path is None:
+            return
+        with self._lock:
+            self._prune(self._connect(), keep)
+
+    def _prune(self, conn: sqlite3.Connection, keep: int):
+        # Caller holds the lock
+        try:
+            conn.execute("DELETE FROM changelog WHERE seq <= (SELECT MAX(seq) FROM changelog) - ?", (keep,))
+        except sqlite3.OperationalError as e:
+            # Busy for the whole timeout: retried after the next CHANGELOG_KEEP changes
+            logger.warning("Change log prune failed: %s", e)
+        self._pruned_seq = self._seq
+
+    def sync(self):
+        if self.path is None:
+            return
+        with self._lock:
+            conn = self._connect()
+            try:
+                version = conn.execute("PRAGMA data_version").fetchone()[0]
+                if version == self._data_version:
+                    return
+                rows = conn.execute(
+                    "SELECT seq, origin, resource, barber_id, day FROM changelog WHERE seq > ? ORDER BY seq",
+                    (self._seq,)
+                ).fetchall()
+            except sqlite3.OperationalError as e:
+                # Locked past the timeout: serve from the caches, retry next request
+                logger.warning("Change log sync failed: %s", e)
+                return
+            self._data_version = version
+            if not rows:
+                return
+            gap = rows[0][0] != self._seq + 1
+            self._seq = rows[-1][0]
+            if self._seq - self._pruned_seq >= CHANGELOG_KEEP:
+                self._prune(conn, CHANGELOG_KEEP)
+
+        if gap:
+            # Pruned (or the log was recreated) past our position
+            logger.warning("Change log gap after seq %d, clearing caches", rows[0][0])
+            reset_caches()
+            return
+        for _, origin, resource, barber_id, day in rows:
+            if origin != WORKER_ID:
+                apply_change(resource, barber_id, date.fromisoformat(day) if day else None)
+
+
+def apply_change(resource: str, barber_id: Optional[int], day: Optional[date]):
+    # Another worker committed this; drop what it affects
+    if resource == "slots":
+        availability_index.invalidate_day(barber_id, day)
+        dashboard_counters.invalidate_day(barber_id, day)
+        resource_versions.bump("slots", barber_id, day)
+        resource_versions.bump("appointments")
+        event_broker.publish_changed(barber_id, day)
+    elif resource == "shifts":
+        shift_schedule.clear()
+        availability_index.reschedule(barber_id, None)
+        resource_versions.bump("shifts", barber_id)
+        event_broker.publish_changed(barber_id)
+    elif resource == "barbers":
+        token_cache.invalidate_barber(barber_id)
+        resource_versions.bump("barbers")
+    elif resource == "holds":
+        with Session(engine) as session:
+            slot_holds.load(session, barber_id)
+
+
+def reset_caches():
+    availability_index.clear()
+    shift_schedule.clear()
+    dashboard_counters.clear()
+    token_cache.clear()
+    with Session(engine) as session:
+        slot_holds.load(session)
+    resource_versions.restart()
+
+
+def database_path(url) -> Optional[str]:
+    database = url.database
+    return database if database and database != ":memory:" else None
+
+
+change_feed = ChangeFeed(database_path(engine.url) if CACHE_COHERENCE else None)
+
+
+class CoherenceMiddleware:
+    # Plain ASGI, like MetricsMiddleware: sync before the handler runs
+    def __init__(self, app, feed: ChangeFeed = change_feed):
+        self.app = app
+        self.feed = feed
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and self.feed.path is not None and not scope["path"].startswith(UNSYNCED_PATHS):
+            await asyncio.wrap_future(sync_pool.submit(self.feed.sync))
+        await self.app(scope, receive, send)
+
+
+async def poll_changes(feed: ChangeFeed = change_feed):
+    # Requests sync on their own (CoherenceMiddleware); this only delivers other
+    # workers' changes to open /events streams while the worker is idle
+    while True:
+        await asyncio.sleep(CHANGE_POLL_SECONDS)
+        if event_broker.subscriber_count():
+            try:
+                await asyncio.wrap_future(sync_pool.submit(feed.sync))
+            except Exception:
+                logger.exception("Change log poll failed")
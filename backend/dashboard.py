@@ -0,0 +1,109 @@
+# backend/dashboard.py
+# Per barber, per day counters behind /barber/dashboard-stats. The dashboard
+# polls constantly, so instead of re-reading the day's appointments each time
+# we keep the booked count, earnings and a sorted list of (start, end) times,
+# updated by the booking/cancellation hooks. A day is read from the DB only once.
+from bisect import bisect_right, insort
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlmodel import Session, select
+
+from backend.models import Appointment
+from backend.services import Service, service_for
+from backend.write_guard import WriteGuard
+
+
+@dataclass
+class DayCounter:
+    count: int = 0
+    earnings: int = 0
+    times: List[Tuple[datetime, datetime]] = field(default_factory=list)  # sorted (start, end)
+
+    def queue_minutes(self, now: datetime) -> int:
+        # Minutes until the last of today's upcoming appointments ends. O(log n):
+        # bookings made through /book never overlap, so the latest start also
+        # has the latest end.
+        upcoming = bisect_right(self.times, (now, datetime.max))
+        if upcoming == len(self.times):
+            return 0
+        return (self.times[-1][1] - now).seconds // 60
+
+
+class DashboardCounters(WriteGuard):
+    def __init__(self):
+        super().__init__()
+        self._days: Dict[Tuple[int, date], DayCounter] = {}
+
+    def clear(self):
+        with self._writing():
+            self._days.clear()
+
+    def cached_summary(self, barber_id: int, day: date, now: datetime) -> Optional[dict]:
+        # None when the day isn't loaded yet (callers then use summary)
+        with self._lock:
+            counter = self._days.get((barber_id, day))
+            return None if counter is None else self._summarize(counter, now)
+
+    def summary(self, barber_id: int, day: date, now: datetime, session: Session) -> dict:
+        result = self.cached_summary(barber_id, day, now)
+        if result is not None:
+            return result
+        with self._lock:
+            token = self._load_token()
+
+        start_of_day = datetime.combine(day, datetime.min.time())
+        rows = session.exec(select(Appointment.time_slot, Appointment.service_type).where(
+            Appointment.barber_id == barber_id,
+            Appointment.time_slot >= start_of_day,
+            Appointment.time_slot < start_of_day + timedelta(days=1)
+        )).all()
+        services = [(time_slot, service_for(service_type)) for time_slot, service_type in rows]
+        counter = DayCounter(
+            count=len(services),
+            earnings=sum(service.price for _, service in services),
+            times=sorted((time_slot, time_slot + timedelta(minutes=service.minutes)) for time_slot, service in services)
+        )
+
+        with self._lock:
+            if self._still_current(token):
+                # Only today matters to the dashboard; forget earlier days
+                for key in [k for k in self._days if k[1] < day]:
+                    del self._days[key]
+                self._days[(barber_id, day)] = counter
+        return self._summarize(counter, now)
+
+    def _summarize(self, counter: DayCounter, now: datetime) -> dict:
+        return {
+            "count": counter.count,
+            "earnings": counter.earnings,
+            "queue_minutes": counter.queue_minutes(now),
+        }
+
+    def add(self, barber_id: int, time_slot: datetime, service: Service):
+        with self._writing():
+            counter = self._days.get((barber_id, time_slot.date()))
+            if counter is not None:
+                counter.count += 1
+                counter.earnings += service.price
+                insort(counter.times, (time_slot, time_slot + timedelta(minutes=service.minutes)))
+
+    def remove(self, barber_id: int, time_slot: datetime, service: Service):
+        with self._writing():
+            counter = self._days.get((barber_id, time_slot.date()))
+            if counter is not None:
+                interval = (time_slot, time_slot + timedelta(minutes=service.minutes))
+                i = bisect_right(counter.times, interval) - 1
+                if i >= 0 and counter.times[i] == interval:
+                    del counter.times[i]
+                    counter.count -= 1
+                    counter.earnings -= service.price
+
+    def invalidate_day(self, barber_id: int, day: date):
+        # Changed by another worker process (see backend/coherence.py)
+        with self._writing():
+            self._days.pop((barber_id, day), None)
+
+
+dashboard_counters = DashboardCounters()
@@ -1,14 +1,147 @@
-from sqlmodel import SQLModel, create_engine, Session
+import logging
+import os
+from sqlalchemy import event
+from sqlalchemy.schema import CreateTable
+from sqlmodel import SQLModel, create_engine, Session, text
+
+logger = logging.getLogger("backend.database")
 
 sqlite_file_name = "database.db"
-sqlite_url = f"sqlite:///{sqlite_file_name}"
+sqlite_url = os.getenv("DATABASE_URL", f"sqlite:///{sqlite_file_name}")
+
+# DB_PROFILE=production turns off SQL echo, switches SQLite to WAL so readers
+# don't block behind the booking writer, and sizes the connection pool.
+DB_PROFILES = {
+    "dev": {
+        "echo": True,
+        "pragmas": {},
+        "pool": {},
+    },
+    "production": {
+        "echo": False,
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "busy_timeout": 5000,    # ms to wait for the write lock instead of failing
+            "cache_size": -64000,    # negative = KiB, i.e. 64 MB page cache
+            "temp_store": "MEMORY",
+        },
+        "pool": {"pool_size": 10, "max_overflow": 20},
+    },
+}
+DB_PROFILE = os.getenv("DB_PROFILE", "dev")
 
 connect_args = {"check_same_thread": False}
-engine = create_engine(sqlite_url, echo=True, connect_args=connect_args)
+
+def apply_pragmas(sync_engine, pragmas):
+    if not pragmas:
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+def engine_options(url, profile_name):
+    profile = DB_PROFILES[profile_name]
+    options = {"echo": profile["echo"]}
+    if ":memory:" not in url and not url.rstrip("/").endswith("sqlite:"):
+        options.update(profile["pool"])
+    return options
+
+def make_engine(url, profile_name=DB_PROFILE):
+    new_engine = create_engine(url, connect_args=connect_args, **engine_options(url, profile_name))
+    apply_pragmas(new_engine, DB_PROFILES[profile_name]["pragmas"])
+    return new_engine
+
+engine = make_engine(sqlite_url)
+
+# "sync" (default) or "async": with "async" the hot endpoints in
+# backend/async_routes.py run on an aiosqlite engine instead of the threadpool.
+DB_MODE = os.getenv("DB_MODE", "sync")
+_async_engine = None
 
 def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
+    migrate_appointment_ids()
+    migrate_indexes()
+
+def migrate_appointment_ids():
+    # Older files have a plain rowid key on appointment, which reuses the ids
+    # of rows moved to archivedappointment. Rebuild it with AUTOINCREMENT and
+    # start the sequence past every id in either table.
+    with engine.begin() as conn:
+        table_sql = conn.execute(text(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'appointment'"
+        )).scalar()
+        if table_sql is None or "AUTOINCREMENT" in table_sql.upper():
+            return
+        # Bookings that already took an archived id get fresh ones
+        conn.execute(text(
+            "UPDATE appointment SET id = id + (SELECT MAX(id) FROM "
+            "(SELECT MAX(id) AS id FROM appointment UNION ALL SELECT MAX(id) FROM archivedappointment)) "
+            "WHERE id IN (SELECT id FROM archivedappointment)"
+        ))
+        for name in conn.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'appointment' AND sql IS NOT NULL"
+        )).scalars().all():
+            conn.execute(text(f"DROP INDEX {name}"))
+        conn.execute(text("ALTER TABLE appointment RENAME TO appointment_rowid"))
+        # Indexes are recreated by migrate_indexes
+        conn.execute(CreateTable(SQLModel.metadata.tables["appointment"]))
+        columns = "id, barber_id, customer_name, time_slot, service_type"
+        conn.execute(text(f"INSERT INTO appointment ({columns}) SELECT {columns} FROM appointment_rowid"))
+        conn.execute(text("DROP TABLE appointment_rowid"))
+        conn.execute(text("DELETE FROM sqlite_sequence WHERE name = 'appointment'"))
+        conn.execute(text(
+            "INSERT INTO sqlite_sequence (name, seq) SELECT 'appointment', COALESCE(MAX(id), 0) FROM "
+            "(SELECT id FROM appointment UNION ALL SELECT id FROM archivedappointment)"
+        ))
+
+def migrate_indexes():
+    # create_all skips tables that already exist, so older database.db files
+    # need the newer indexes added here.
+    with engine.begin() as conn:
+        # Keep only the newest shift per (barber, weekday, start) - the old
+        # /shifts delete+insert could leave duplicates behind
+        conn.execute(text(
+            "DELETE FROM shift WHERE id NOT IN "
+            "(SELECT MAX(id) FROM shift GROUP BY barber_id, weekday, start_hour)"
+        ))
+        # Split shifts need several rows per weekday; replaced by
+        # ix_shift_barber_weekday_start
+        conn.execute(text("DROP INDEX IF EXISTS ix_shift_barber_weekday"))
+        duplicate_bookings = conn.execute(text(
+            "SELECT COUNT(*) FROM (SELECT 1 FROM appointment "
+            "GROUP BY barber_id, time_slot HAVING COUNT(*) > 1)"
+        )).scalar()
+
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name == "ix_appointment_barber_slot" and duplicate_bookings:
+                # Never delete customer bookings automatically
+                logger.warning("%d double-booked slots found, skipping %s. Resolve them and restart.",
+                               duplicate_bookings, index.name)
+                continue
+            index.create(engine, checkfirst=True)
 
 def get_session():
     with Session(engine) as session:
         yield session
+
+def get_async_engine():
+    # Created lazily so aiosqlite is only needed when DB_MODE=async
+    global _async_engine
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+        async_url = sqlite_url.replace("sqlite://", "sqlite+aiosqlite://", 1)
+        _async_engine = create_async_engine(async_url, **engine_options(async_url, DB_PROFILE))
+        apply_pragmas(_async_engine.sync_engine, DB_PROFILES[DB_PROFILE]["pragmas"])
+    return _async_engine
+
+async def get_async_session():
+    from sqlmodel.ext.asyncio.session import AsyncSession
+    async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+        yield session
@@ -0,0 +1,128 @@
+# backend/events.py
+# In-process pub/sub for live availability updates (served as SSE on /events).
+# Publishers (the booking/shift handlers, often on threadpool threads) never
+# block: each subscriber has a bounded queue, and a subscriber that falls
+# behind is dropped instead of slowing everyone else down.
+import asyncio
+import json
+import threading
+from datetime import date
+from typing import Dict, List, Optional, Set, Tuple
+
+SUBSCRIBER_QUEUE_SIZE = 100
+KEEPALIVE_SECONDS = 15
+
+
+class Subscription:
+    def __init__(self, loop: asyncio.AbstractEventLoop, barber_id: Optional[int], day: Optional[date], queue_size: int):
+        self.loop = loop
+        self.barber_id = barber_id
+        self.day = day  # None for the admin feed
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = False
+
+    def wants_day(self, barber_id: int, day: date) -> bool:
+        return self.day is None or (self.barber_id == barber_id and self.day == day)
+
+    def wants_weekday(self, barber_id: int, weekday: int) -> bool:
+        return self.day is None or (self.barber_id == barber_id and self.day.weekday() == weekday)
+
+    def wants_range(self, barber_id: int, start: date, end: date) -> bool:
+        return self.day is None or (self.barber_id == barber_id and start <= self.day <= end)
+
+    def _deliver(self, event):
+        # Runs on the subscriber's event loop
+        if self.dropped:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)  # tells the stream to close
+
+
+class EventBroker:
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._by_barber: Dict[int, Set[Subscription]] = {}
+        self._admin: Set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, barber_id: Optional[int] = None, day: Optional[date] = None) -> Subscription:
+        # Must be called from the event loop that will read the subscription.
+        # No barber/day means the admin feed (every event).
+        subscription = Subscription(asyncio.get_running_loop(), barber_id, day, self.queue_size)
+        with self._lock:
+            if day is None:
+                self._admin.add(subscription)
+            else:
+                self._by_barber.setdefault(barber_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._admin.discard(subscription)
+            subs = self._by_barber.get(subscription.barber_id)
+            if subs is not None:
+                subs.discard(subscription)
+                if not subs:
+                    del self._by_barber[subscription.barber_id]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._admin) + sum(len(subs) for subs in self._by_barber.values())
+
+    def _targets(self, barber_id: int, wants):
+        with self._lock:
+            return [s for s in self._by_barber.get(barber_id, ()) if wants(s)] + list(self._admin)
+
+    def _send(self, targets, event):
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, event)
+            except RuntimeError:
+                # Loop already closed - the stream is gone
+                self.unsubscribe(subscription)
+
+    def publish_slot(self, event_type: str, barber_id: int, day: date, time: str, minutes: int):
+        event = {"type": event_type, "barber_id": barber_id, "date": day.isoformat(), "time": time, "minutes": minutes}
+        self._send(self._targets(barber_id, lambda s: s.wants_day(barber_id, day)), event)
+
+    def publish_shift(self, barber_id: int, weekday: int, hours: List[Tuple[int, int]]):
+        event = {"type": "shift-changed", "barber_id": barber_id, "weekday": weekday, "hours": hours}
+        self._send(self._targets(barber_id, lambda s: s.wants_weekday(barber_id, weekday)), event)
+
+    def publish_override(self, barber_id: int, start: date, end: date, hours: Optional[List[Tuple[int, int]]]):
+        # hours=None: the override was removed and the weekly shifts apply again
+        event = {"type": "shift-changed", "barber_id": barber_id, "start_date": start.isoformat(),
+                 "end_date": end.isoformat(), "hours": hours}
+        self._send(self._targets(barber_id, lambda s: s.wants_range(barber_id, start, end)), event)
+
+    def publish_changed(self, barber_id: int, day: Optional[date] = None):
+        # Changed by another worker process: the change log only says which
+        # barber's day (or, for day=None, whose shifts) changed, not how
+        if day is None:
+            event = {"type": "shift-changed", "barber_id": barber_id}
+            self._send(self._targets(barber_id, lambda s: True), event)
+        else:
+            event = {"type": "slot-changed", "barber_id": barber_id, "date": day.isoformat()}
+            self._send(self._targets(barber_id, lambda s: s.wants_day(barber_id, day)), event)
+
+async def sse_stream(broker: EventBroker, subscription: Subscription):
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if event is None:
+                return
+            yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+    finally:
+        broker.unsubscribe(subscription)
+
+
+event_broker = EventBroker()
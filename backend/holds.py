@@ -0,0 +1,113 @@
+# backend/holds.py
+# Short-lived slot holds ("reserved for 2 minutes while you fill the form").
+# Stored in the SlotHold table so every worker process sees them; each worker
+# also keeps the live holds in memory for /slots and /book. Handlers write the
+# row in their transaction (hold / delete), then update memory with added /
+# removed once committed, like the booking hooks; holds other workers change
+# are reloaded from the table (see backend/coherence.py). A hold is only a
+# courtesy to the customer, the overlap check in /book is what actually
+# prevents double bookings.
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import delete
+from sqlmodel import Session, select
+
+from backend.availability import Interval, booking_interval
+from backend.models import SlotHold
+from backend.write_guard import WriteGuard
+
+HOLD_SECONDS = 120
+
+
+class SlotHolds(WriteGuard):
+    def __init__(self, ttl_seconds: int = HOLD_SECONDS):
+        super().__init__()
+        self.ttl_seconds = ttl_seconds
+        # hold_id -> (barber_id, start, end, expires_at)
+        self._holds: Dict[str, Tuple[int, datetime, datetime, datetime]] = {}
+
+    def clear(self):
+        with self._writing():
+            self._holds.clear()
+
+    def load(self, session: Session, barber_id: Optional[int] = None):
+        # Replace the live holds (all, or one barber's) with the table's
+        while True:
+            with self._lock:
+                token = self._load_token()
+            statement = select(SlotHold).where(SlotHold.expires_at > datetime.now())
+            if barber_id is not None:
+                statement = statement.where(SlotHold.barber_id == barber_id)
+            rows = session.exec(statement).all()
+            with self._lock:
+                if self._still_current(token):
+                    for hold_id in [k for k, hold in self._holds.items() if barber_id in (None, hold[0])]:
+                        del self._holds[hold_id]
+                    for row in rows:
+                        self._holds[row.id] = (row.barber_id, row.start, row.end, row.expires_at)
+                    return
+
+    def hold(self, barber_id: int, start: datetime, end: datetime, session: Session) -> Optional[SlotHold]:
+        # Inside the caller's transaction; None (rolled back) if a live hold
+        # overlaps. Writes before the check for the same reason as /book: the
+        # write lock keeps another worker from passing the check meanwhile.
+        now = datetime.now()
+        session.execute(delete(SlotHold).where(SlotHold.expires_at <= now))
+        hold = SlotHold(id=uuid.uuid4().hex, barber_id=barber_id, start=start, end=end,
+                        expires_at=now + timedelta(seconds=self.ttl_seconds))
+        session.add(hold)
+        session.flush()
+        taken = session.exec(select(SlotHold.id).where(
+            SlotHold.barber_id == barber_id,
+            SlotHold.start < end,
+            SlotHold.end > start,
+            SlotHold.id != hold.id
+        )).first()
+        if taken is not None:
+            session.rollback()
+            return None
+        return hold
+
+    def delete(self, hold_id: str, session: Session) -> bool:
+        # Inside the caller's transaction; False if there was no such hold
+        return session.execute(delete(SlotHold).where(SlotHold.id == hold_id)).rowcount > 0
+
+    def added(self, hold: SlotHold):
+        # Called once the hold is committed
+        with self._writing():
+            self._holds[hold.id] = (hold.barber_id, hold.start, hold.end, hold.expires_at)
+
+    def removed(self, hold_id: str):
+        # Called once the deletion is committed
+        with self._writing():
+            self._holds.pop(hold_id, None)
+
+    def _purge(self, now: datetime):
+        # Caller holds the lock
+        expired = [hold_id for hold_id, hold in self._holds.items() if hold[3] <= now]
+        for hold_id in expired:
+            del self._holds[hold_id]
+
+    def _overlapping(self, barber_id: int, start: datetime, end: datetime):
+        return [hold_id for hold_id, (b_id, held_start, held_end, _) in self._holds.items()
+                if b_id == barber_id and held_start < end and start < held_end]
+
+    def can_book(self, barber_id: int, start: datetime, end: datetime, hold_id: Optional[str] = None) -> bool:
+        # Free intervals and intervals held by the caller are bookable
+        with self._lock:
+            self._purge(datetime.now())
+            return all(other == hold_id for other in self._overlapping(barber_id, start, end))
+
+    def held_intervals(self, barber_id: int, day: date) -> Tuple[Interval, ...]:
+        # The day's holds in minutes since midnight, sorted
+        with self._lock:
+            self._purge(datetime.now())
+            held = [booking_interval(start, int((end - start).total_seconds()) // 60)
+                    for b_id, start, end, _ in self._holds.values()
+                    if b_id == barber_id and start.date() == day]
+        return tuple(sorted(held))
+
+
+slot_holds = SlotHolds()
@@ -0,0 +1,186 @@
+# backend/listing.py
+# Keyset-paginated appointment listing and streaming export for /appointments.
+# Pages are ordered by (time_slot, id); the cursor is the last row's key, so
+# every page is an index range scan no matter how deep into history it is.
+# Pages that reach back past the newest archived booking also read the
+# archive table (backend/archive.py) and merge the two by key.
+import heapq
+import base64
+import csv
+import io
+import json
+from datetime import date, datetime, timedelta
+from itertools import islice
+from operator import itemgetter
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import tuple_
+from sqlmodel import Session, select
+
+from backend.archive import archived_until
+from backend.booking import parse_day
+from backend.database import engine
+from backend.models import Appointment, ArchivedAppointment, Barber
+from backend.responses import fast_json
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+EXPORT_BATCH_SIZE = 500
+
+FIELD_NAMES = ["id", "barber_id", "customer_name", "time_slot", "service_type", "barber_name"]
+DEFAULT_FIELDS = ["id", "barber_id", "customer_name", "time_slot", "barber_name"]
+
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    if not fields:
+        return DEFAULT_FIELDS
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in FIELD_NAMES]
+    if unknown or not names:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return names
+
+
+def encode_cursor(time_slot: datetime, appt_id: int) -> str:
+    raw = f"{time_slot.isoformat()}|{appt_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        time_slot, appt_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(time_slot), int(appt_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+class AppointmentFilter:
+    def __init__(self, barber_id: Optional[int] = None, start: Optional[date] = None, end: Optional[date] = None):
+        self.barber_id = barber_id
+        self.start = start
+        self.end = end
+
+    def apply(self, statement, model=Appointment):
+        if self.barber_id is not None:
+            statement = statement.where(model.barber_id == self.barber_id)
+        if self.start:
+            statement = statement.where(model.time_slot >= datetime.combine(self.start, datetime.min.time()))
+        if self.end:
+            statement = statement.where(model.time_slot < datetime.combine(self.end + timedelta(days=1), datetime.min.time()))
+        return statement
+
+
+def field_column(model, name: str):
+    return Barber.name if name == "barber_name" else getattr(model, name)
+
+
+def page_statement(model, filters: AppointmentFilter, fields: List[str], after: Optional[Tuple[datetime, int]], limit: int):
+    # id and time_slot are always selected since they make up the cursor
+    columns = [model.time_slot, model.id] + [field_column(model, name) for name in fields]
+    statement = select(*columns)
+    if "barber_name" in fields:
+        statement = statement.join(Barber, model.barber_id == Barber.id)
+    statement = filters.apply(statement, model)
+    if after is not None:
+        statement = statement.where(tuple_(model.time_slot, model.id) > tuple_(*after))
+    return statement.order_by(model.time_slot, model.id).limit(limit + 1)
+
+
+def reaches_archive(session: Session, filters: AppointmentFilter, after: Optional[Tuple[datetime, int]]) -> bool:
+    newest = archived_until(session)
+    if newest is None:
+        return False
+    lower = [after[0]] if after is not None else []
+    if filters.start:
+        lower.append(datetime.combine(filters.start, datetime.min.time()))
+    return not lower or max(lower) <= newest
+
+
+def fetch_page(session: Session, filters: AppointmentFilter, fields: List[str], after: Optional[Tuple[datetime, int]], limit: int):
+    # Returns (rows as dicts, cursor for the next page or None)
+    results = session.exec(page_statement(Appointment, filters, fields, after, limit)).all()
+    if reaches_archive(session, filters, after):
+        # Archived rows are normally all older, but a past booking added after
+        # an archive run can interleave, so merge rather than concatenate
+        cold = session.exec(page_statement(ArchivedAppointment, filters, fields, after, limit)).all()
+        results = list(islice(heapq.merge(cold, results, key=itemgetter(0, 1)), limit + 1))
+    has_more = len(results) > limit
+    results = results[:limit]
+    rows = [dict(zip(fields, result[2:])) for result in results]
+    next_cursor = encode_cursor(results[-1][0], results[-1][1]) if has_more else None
+    return rows, next_cursor
+
+
+def iter_batches(session: Session, filters: AppointmentFilter, fields: List[str]):
+    after = None
+    while True:
+        rows, next_cursor = fetch_page(session, filters, fields, after, EXPORT_BATCH_SIZE)
+        if rows:
+            yield rows
+        if next_cursor is None:
+            return
+        after = decode_cursor(next_cursor)
+
+
+def export_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def export_ndjson(session: Session, filters: AppointmentFilter, fields: List[str]):
+    for rows in iter_batches(session, filters, fields):
+        yield "".join(json.dumps({k: export_value(v) for k, v in row.items()}) + "\n" for row in rows)
+
+
+def export_csv(session: Session, filters: AppointmentFilter, fields: List[str]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for rows in iter_batches(session, filters, fields):
+        for row in rows:
+            writer.writerow([export_value(row[name]) for name in fields])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+EXPORT_FORMATS = {
+    "ndjson": (export_ndjson, "application/x-ndjson"),
+    "csv": (export_csv, "text/csv"),
+}
+
+
+def stream_export(export, filters: AppointmentFilter, fields: List[str]):
+    # The export outlives the request's session, so it uses its own
+    with Session(engine) as session:
+        yield from export(session, filters, fields)
+
+
+def list_appointments(
+    session: Session,
+    response: Response,
+    barber_id: Optional[int],
+    start_date: Optional[str],
+    end_date: Optional[str],
+    fields: Optional[str],
+    cursor: Optional[str],
+    limit: int,
+    format: Optional[str]
+):
+    filters = AppointmentFilter(barber_id, parse_day(start_date), parse_day(end_date))
+    field_names = parse_fields(fields)
+
+    if format:
+        if format not in EXPORT_FORMATS:
+            raise HTTPException(status_code=400, detail="format must be ndjson or csv")
+        export, media_type = EXPORT_FORMATS[format]
+        return StreamingResponse(stream_export(export, filters, field_names), media_type=media_type)
+
+    after = decode_cursor(cursor) if cursor else None
+    rows, next_cursor = fetch_page(session, filters, field_names, after, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return fast_json(rows, response)
@@ -1,20 +1,62 @@
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlmodel import Session, select
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import List, Optional, Tuple
+import asyncio
 import os
 
-from backend.database import create_db_and_tables, get_session
-from backend.models import Barber, Appointment, Shift
+from backend.database import create_db_and_tables, get_session, engine, DB_MODE
+from backend.models import Barber, Appointment, ArchivedAppointment, Shift, ShiftOverride, SlotHold, OverrideRequest, BarberCard, BarberProfile, AppointmentRow
+from backend.availability import availability_index, booking_interval
+from backend.holds import slot_holds
+from backend.stats import record_booking, backfill_daily_stats, summarize
+from backend.booking import (
+    parse_time_slot,
+    parse_day,
+    parse_service,
+    parse_shift_hours,
+    visible_slots,
+    conflicts_statement,
+    has_conflict,
+    after_booking,
+    after_cancellation,
+    after_shift_change,
+    after_override_change,
+    after_barber_change,
+    dashboard_stats
+)
+from backend.dashboard import dashboard_counters
+from backend.events import event_broker, sse_stream
+from backend.versions import (
+    not_modified,
+    barbers_tag,
+    slots_tag,
+    appointments_tag,
+    BARBERS_CACHE_CONTROL,
+    SLOTS_CACHE_CONTROL,
+    APPOINTMENTS_CACHE_CONTROL
+)
+from backend.schedule import format_hours
+from backend.coherence import CoherenceMiddleware, change_feed, poll_changes, record_change
+from backend.services import SERVICES, DEFAULT_SERVICE, service_for
+from backend.next_available import next_available
+from backend.listing import list_appointments, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from backend.responses import FastJSONResponse, SerializedCache, GZIP_LEVEL, GZIP_MIN_SIZE
+from backend.static_assets import PrecompressedStaticFiles
+from backend.metrics import MetricsMiddleware, instrument_engine, request_metrics, format_samples
 from backend.auth import (
-    verify_password, 
+    run_login, 
     create_access_token, 
     get_current_barber, 
-    get_current_admin
+    get_current_admin,
+    token_cache
 )
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse, PlainTextResponse
+import json
 
 # (SECRET_KEY defined in auth.py, we can reuse or just use auth functions)
 
@@ -27,201 +69,376 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Large JSON (e.g. /appointments pages and exports); static/ is precompressed
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_SIZE, compresslevel=GZIP_LEVEL)
+
+# Per-route latency, status and SQL statement metrics (served on /metrics)
+app.add_middleware(MetricsMiddleware)
+instrument_engine(engine)
+
+# Drops cache entries other worker processes changed (see backend/coherence.py)
+app.add_middleware(CoherenceMiddleware)
+
+# Async DB path: registered first so these handlers take precedence over the
+# sync ones below for /slots, /book, /appointments and /barber/dashboard-stats
+if DB_MODE == "async":
+    from backend.async_routes import router as async_router
+    from backend.database import get_async_engine
+    app.include_router(async_router)
+    instrument_engine(get_async_engine().sync_engine)
+
 # Mount static files
 static_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static")
 if os.path.exists(static_path):
-    app.mount("/static", StaticFiles(directory=static_path), name="static")
+    app.mount("/static", PrecompressedStaticFiles(directory=static_path), name="static")
 
 @app.on_event("startup")
 def on_startup():
     create_db_and_tables()
+    with Session(engine) as session:
+        backfill_daily_stats(session)
+        slot_holds.load(session)
+    change_feed.prune()
+    change_feed.clear()
     # Seeding is handled by seed_data.py now
 
+@app.on_event("startup")
+async def start_change_poller():
+    # Other workers' changes reach open /events streams without waiting for a request
+    if change_feed.path is not None:
+        app.state.change_poller = asyncio.create_task(poll_changes())
+
+@app.on_event("shutdown")
+async def stop_change_poller():
+    poller = getattr(app.state, "change_poller", None)
+    if poller is not None:
+        poller.cancel()
+
+@app.get("/metrics")
+def get_metrics():
+    cache = token_cache.stats()
+    samples = {
+        "token_cache_hits_total": ("counter", "Token cache hits.", cache["hits"]),
+        "token_cache_misses_total": ("counter", "Token cache misses.", cache["misses"]),
+        "token_cache_evictions_total": ("counter", "Token cache evictions.", cache["evictions"]),
+        "token_cache_size": ("gauge", "Tokens currently cached.", cache["size"]),
+        "sse_subscribers": ("gauge", "Open /events streams.", event_broker.subscriber_count()),
+    }
+    return PlainTextResponse(request_metrics.render() + format_samples(samples), media_type="text/plain; version=0.0.4")
+
 @app.post("/login")
-def login(form_data: OAuth2PasswordRequestForm = Depends(), session: Session = Depends(get_session)):
-    statement = select(Barber).where(Barber.username == form_data.username)
-    barber = session.exec(statement).first()
+async def login(form_data: OAuth2PasswordRequestForm = Depends()):
+    # Hash verification happens on the bounded login pool (429 when saturated)
+    barber = await run_login(form_data.username, form_data.password)
     
-    if not barber or not verify_password(form_data.password, barber.hashed_password):
+    if not barber:
         raise HTTPException(status_code=400, detail="Incorrect username or password")
     
     access_token = create_access_token(data={"sub": barber.username})
     return {"access_token": access_token, "token_type": "bearer", "role": barber.role, "name": barber.name}
     
-@app.get("/users/me")
+@app.get("/users/me", response_model=BarberProfile)
 def read_users_me(current_barber: Barber = Depends(get_current_barber)):
     return current_barber
 
-def get_smart_slots(date_str: str, barber_id: int, session: Session):
-    # 1. Determine Weekday (0=Mon, 6=Sun)
-    dt_obj = datetime.strptime(date_str, "%Y-%m-%d")
-    weekday_int = dt_obj.weekday()
+def get_smart_slots(date_str: str, barber_id: int, session: Session, minutes: int = SERVICES[DEFAULT_SERVICE].minutes):
+    # Served from the in-process availability index; the DB is only read
+    # the first time a (barber, day) is requested.
+    day = datetime.strptime(date_str, "%Y-%m-%d").date()
+    return visible_slots(barber_id, day, availability_index.day(barber_id, day, session), minutes)
 
-    # 2. Get the Barber's Shift for this specific day
-    statement = select(Shift).where(
-        Shift.barber_id == barber_id, 
-        Shift.weekday == weekday_int
-    )
-    shift = session.exec(statement).first()
-    
-    # If no shift found, barber is OFF today
-    if not shift:
-        return []
-
-    # 3. Generate slots based on THAT shift
-    # Create start/end datetime objects for the loop
-    current_time = dt_obj.replace(hour=shift.start_hour, minute=0, second=0)
-    end_time = dt_obj.replace(hour=shift.end_hour, minute=0, second=0)
-    
-    potential_slots = []
-    while current_time < end_time:
-        potential_slots.append(current_time)
-        current_time += timedelta(minutes=30) # 30 min duration
-
-    # 4. Filter out existing appointments
-    start_of_day = dt_obj.replace(hour=0, minute=0, second=0, microsecond=0)
-    end_of_day = dt_obj.replace(hour=23, minute=59, second=59, microsecond=999999)
-    
-    statement = select(Appointment).where(
-        Appointment.barber_id == barber_id,
-        Appointment.time_slot >= start_of_day,
-        Appointment.time_slot <= end_of_day
-    )
-    appointments = session.exec(statement).all()
-    booked_times = [appt.time_slot for appt in appointments]
-    
-    return [slot.strftime("%H:%M") for slot in potential_slots if slot not in booked_times]
+@app.get("/services")
+def get_services():
+    return [{"name": name, "minutes": service.minutes, "price": service.price} for name, service in SERVICES.items()]
+
+def load_barber_cards(session: Session):
+    columns = [getattr(Barber, name) for name in BarberCard.model_fields]
+    return [dict(zip(BarberCard.model_fields, row)) for row in session.exec(select(*columns).order_by(Barber.id)).all()]
 
-@app.get("/barbers", response_model=List[Barber])
-def get_barbers(session: Session = Depends(get_session)):
-    return session.exec(select(Barber)).all()
+# The barber list changes rarely (after_barber_change bumps its version), so
+# its JSON is serialized once and reused
+barber_list = SerializedCache("barbers", load_barber_cards)
+
+@app.get("/barbers", response_model=List[BarberCard])
+def get_barbers(request: Request, response: Response, session: Session = Depends(get_session)):
+    cached = not_modified(request, response, barbers_tag(), BARBERS_CACHE_CONTROL)
+    if cached:
+        return cached
+    return barber_list.response(session, response)
 
 @app.get("/slots")
-def get_slots(barber_id: int, date: str, session: Session = Depends(get_session)):
-    return get_smart_slots(date, barber_id, session)
+def get_slots(request: Request, response: Response, barber_id: int, date: str, service: str = DEFAULT_SERVICE, session: Session = Depends(get_session)):
+    day = parse_day(date)
+    minutes = parse_service(service).minutes
+    tag = slots_tag(barber_id, day, slot_holds.held_intervals(barber_id, day), minutes)
+    cached = not_modified(request, response, tag, SLOTS_CACHE_CONTROL)
+    if cached:
+        return cached
+    return get_smart_slots(date, barber_id, session, minutes)
 
-@app.post("/shifts")
-def create_shift(shift: Shift, session: Session = Depends(get_session)):
-    # Remove existing shift for that day if any
-    statement = select(Shift).where(
-        Shift.barber_id == shift.barber_id, 
-        Shift.weekday == shift.weekday
-    )
-    existing_shift = session.exec(statement).first()
-    if existing_shift:
-        session.delete(existing_shift)
-        session.commit()
-    
-    session.add(shift)
-    session.commit()
-    return {"message": "Shift saved"}
+# Bulk availability: one request for a whole calendar view instead of one /slots
+# call per barber per day.
+MAX_BULK_DAYS = 62
+STREAM_CHUNK_DAYS = 7
 
-@app.post("/book")
-def book_appointment(barber_id: int, date: str, time: str, name: str, session: Session = Depends(get_session)):
-    time_slot_str = f"{date} {time}"
+def parse_date_range(start_date: str, end_date: str):
     try:
-        time_slot = datetime.strptime(time_slot_str, "%Y-%m-%d %H:%M")
+        start = datetime.strptime(start_date, "%Y-%m-%d").date()
+        end = datetime.strptime(end_date, "%Y-%m-%d").date()
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid date format")
+    if end < start:
+        raise HTTPException(status_code=400, detail="end_date is before start_date")
+    return start, end
+
+def availability_rows(grid, minutes):
+    # grid is {(barber_id, date): DayIntervals}, ordered barber by barber, day by day
+    for (barber_id, day), intervals in grid.items():
+        yield {"barber_id": barber_id, "date": day.isoformat(), "slots": visible_slots(barber_id, day, intervals, minutes)}
 
-    statement = select(Appointment).where(
-        Appointment.barber_id == barber_id,
-        Appointment.time_slot == time_slot
+def stream_availability(barber_ids, start, end, minutes):
+    # Each chunk is one appointments query (working hours come from the
+    # compiled schedule), so only one chunk of the grid is ever held in memory.
+    # Chunks aren't added to the availability index: the range is unbounded.
+    with Session(engine) as session:
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(end, chunk_start + timedelta(days=STREAM_CHUNK_DAYS - 1))
+            grid = availability_index.load_range(barber_ids, chunk_start, chunk_end, session, store=False)
+            for row in availability_rows(grid, minutes):
+                yield json.dumps(row) + "\n"
+            chunk_start = chunk_end + timedelta(days=1)
+
+@app.get("/slots/bulk")
+def get_bulk_slots(
+    start_date: str,
+    end_date: str,
+    barber_ids: Optional[List[int]] = Query(default=None),
+    stream: bool = False,
+    service: str = DEFAULT_SERVICE,
+    session: Session = Depends(get_session)
+):
+    start, end = parse_date_range(start_date, end_date)
+    minutes = parse_service(service).minutes
+    if stream:
+        return StreamingResponse(stream_availability(barber_ids, start, end, minutes), media_type="application/x-ndjson")
+
+    if (end - start).days + 1 > MAX_BULK_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range too large (max {MAX_BULK_DAYS} days, use stream=true)")
+    grid = availability_index.load_range(barber_ids, start, end, session)
+    return FastJSONResponse(list(availability_rows(grid, minutes)))
+
+@app.get("/slots/next")
+def get_next_available(
+    date: Optional[str] = None,
+    time: Optional[str] = None,
+    limit: int = Query(default=5, ge=1, le=50),
+    service: str = DEFAULT_SERVICE,
+    checked_in: bool = False,
+    session: Session = Depends(get_session)
+):
+    # Earliest free start times across all active barbers (checked_in=true for
+    # walk-ins: only barbers in the shop), from date/time or from now
+    if date:
+        start = parse_time_slot(date, time or "00:00")
+    else:
+        start = datetime.now().replace(second=0, microsecond=0)
+    return next_available(session, start, parse_service(service).minutes, limit, checked_in)
+
+@app.get("/events")
+async def subscribe_events(barber_id: Optional[int] = None, date: Optional[str] = None, admin: bool = False):
+    # Server-sent events instead of polling /slots: subscribe to one barber's
+    # day (barber_id + date) or to the admin feed (admin=true, every event).
+    # Public for now (Phase 1)
+    if admin:
+        subscription = event_broker.subscribe()
+    elif barber_id is not None and date:
+        subscription = event_broker.subscribe(barber_id, parse_day(date))
+    else:
+        raise HTTPException(status_code=400, detail="Pass barber_id and date, or admin=true")
+    return StreamingResponse(
+        sse_stream(event_broker, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
-    if session.exec(statement).first():
-         raise HTTPException(status_code=400, detail="Slot already booked")
-    
-    appt = Appointment(barber_id=barber_id, customer_name=name, time_slot=time_slot)
-    session.add(appt)
+
+def replace_weekday_shifts(session: Session, barber_id: int, weekday: int, hours: List[Tuple[int, int]]):
+    # Validated before anything is written: the schedule loader indexes by weekday
+    if not 0 <= weekday <= 6:
+        raise HTTPException(status_code=400, detail="weekday must be 0-6")
+    hours = parse_shift_hours(hours)
+    for shift in session.exec(select(Shift).where(Shift.barber_id == barber_id, Shift.weekday == weekday)).all():
+        session.delete(shift)
+    session.flush()
+    session.add_all([Shift(barber_id=barber_id, weekday=weekday, start_hour=start, end_hour=end) for start, end in hours])
+    record_change(session, "shifts", barber_id)
+    session.commit()
+    after_shift_change(barber_id, weekday, hours)
+
+@app.post("/shifts")
+def create_shift(shift: Shift, session: Session = Depends(get_session)):
+    # One continuous shift for that weekday, replacing whatever was there
+    hours = [(shift.start_hour, shift.end_hour)] if shift.end_hour > shift.start_hour else []
+    replace_weekday_shifts(session, shift.barber_id, shift.weekday, hours)
+    return {"message": "Shift saved"}
+
+@app.put("/shifts/{barber_id}/{weekday}")
+def set_weekday_shifts(barber_id: int, weekday: int, hours: List[Tuple[int, int]], session: Session = Depends(get_session)):
+    # Split shifts: e.g. [[9, 12], [13, 17]]; [] makes it a day off
+    replace_weekday_shifts(session, barber_id, weekday, hours)
+    return {"message": "Shift saved"}
+
+@app.post("/shifts/overrides")
+def create_shift_override(request: OverrideRequest, session: Session = Depends(get_session)):
+    # Holidays, sick days and one-off hours for a date range
+    if request.end_date < request.start_date:
+        raise HTTPException(status_code=400, detail="end_date is before start_date")
+    override = ShiftOverride(barber_id=request.barber_id, start_date=request.start_date,
+                             end_date=request.end_date, hours=format_hours(parse_shift_hours(request.hours)))
+    session.add(override)
+    record_change(session, "shifts", request.barber_id)
+    session.commit()
+    session.refresh(override)
+    after_override_change(override)
+    return {"message": "Override saved", "id": override.id}
+
+@app.delete("/shifts/overrides/{override_id}")
+def delete_shift_override(override_id: int, session: Session = Depends(get_session)):
+    override = session.get(ShiftOverride, override_id)
+    if not override:
+        raise HTTPException(status_code=404, detail="Override not found")
+    session.delete(override)
+    record_change(session, "shifts", override.barber_id)
+    session.commit()
+    after_override_change(override, removed=True)
+    return {"message": "Override deleted"}
+
+@app.post("/slots/hold")
+def hold_slot(barber_id: int, date: str, time: str, service: str = DEFAULT_SERVICE, session: Session = Depends(get_session)):
+    # Reserve a free interval for a couple of minutes while the customer fills the form
+    time_slot = parse_time_slot(date, time)
+    minutes = parse_service(service).minutes
+    intervals = availability_index.day(barber_id, time_slot.date(), session)
+    if not intervals.fits(*booking_interval(time_slot, minutes)):
+        raise HTTPException(status_code=400, detail="Slot already booked")
+
+    hold = slot_holds.hold(barber_id, time_slot, time_slot + timedelta(minutes=minutes), session)
+    if hold is None:
+        raise HTTPException(status_code=400, detail="Slot is on hold")
+    record_change(session, "holds", barber_id)
+    session.commit()
+
+    slot_holds.added(hold)
+    return {"hold_id": hold.id, "expires_at": hold.expires_at}
+
+@app.delete("/slots/hold/{hold_id}")
+def release_hold(hold_id: str, session: Session = Depends(get_session)):
+    hold = session.get(SlotHold, hold_id)
+    if hold is None or not slot_holds.delete(hold_id, session):
+        raise HTTPException(status_code=404, detail="Hold not found")
+    record_change(session, "holds", hold.barber_id)
     session.commit()
+
+    slot_holds.removed(hold_id)
+    return {"message": "Released"}
+
+@app.post("/book")
+def book_appointment(barber_id: int, date: str, time: str, name: str, hold_id: Optional[str] = None, service: str = DEFAULT_SERVICE, session: Session = Depends(get_session)):
+    time_slot = parse_time_slot(date, time)
+    details = parse_service(service)
+    if not slot_holds.can_book(barber_id, time_slot, time_slot + timedelta(minutes=details.minutes), hold_id):
+        raise HTTPException(status_code=400, detail="Slot is on hold")
+    # Cheap early rejection when the day is already indexed
+    cached = availability_index.cached_day(barber_id, time_slot.date())
+    if cached is not None and cached.overlaps(*booking_interval(time_slot, details.minutes)):
+        raise HTTPException(status_code=400, detail="Slot already booked")
+
+    # INSERT first: it takes SQLite's write lock, so no other booking can
+    # commit between the overlap check below and our commit. The unique
+    # (barber_id, time_slot) index still rejects same-start duplicates.
+    appt = Appointment(barber_id=barber_id, customer_name=name, time_slot=time_slot, service_type=service)
+    try:
+        session.add(appt)
+        session.flush()
+        conflict = has_conflict(session.exec(conflicts_statement(appt, details.minutes)).all(), time_slot)
+    except IntegrityError:
+        conflict = True
+    if conflict:
+        session.rollback()
+        raise HTTPException(status_code=400, detail="Slot already booked")
+    record_booking(session, barber_id, time_slot, details.price)
+    record_change(session, "slots", barber_id, time_slot.date())
+    if hold_id and slot_holds.delete(hold_id, session):
+        record_change(session, "holds", barber_id)
+    session.commit()
+
+    after_booking(barber_id, time_slot, service, hold_id)
     return {"message": "Booking successful"}
 
-@app.get("/appointments")
-def get_all_appointments(session: Session = Depends(get_session)):
+@app.get("/appointments", response_model=List[AppointmentRow])
+def get_all_appointments(
+    request: Request,
+    response: Response,
+    barber_id: Optional[int] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    fields: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    format: Optional[str] = None,
+    session: Session = Depends(get_session)
+):
     # Public for now (Phase 1)
-    statement = select(Appointment, Barber).where(Appointment.barber_id == Barber.id)
-    results = session.exec(statement).all()
-    # Return a custom structure
-    return [
-        {
-            "id": appt.id,
-            "barber_id": appt.barber_id,
-            "customer_name": appt.customer_name,
-            "time_slot": appt.time_slot,
-            "barber_name": barber.name
-        } 
-        for appt, barber in results
-    ]
+    # One page ordered by (time_slot, id); the next page's cursor is returned in
+    # the X-Next-Cursor header. format=ndjson|csv streams the whole selection.
+    cached = not_modified(request, response, appointments_tag(), APPOINTMENTS_CACHE_CONTROL)
+    if cached:
+        return cached
+    return list_appointments(session, response, barber_id, start_date, end_date, fields, cursor, limit, format)
 
 @app.get("/admin/stats")
-def get_admin_stats(session: Session = Depends(get_session)):
+def get_admin_stats(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    by_barber: bool = False,
+    session: Session = Depends(get_session)
+):
     # Public for now (Phase 1)
-    
-    # Total appointments
-    total_bookings = session.exec(select(Appointment)).all()
-    count = len(total_bookings)
-    
-    # Revenue (assuming $25 per cut)
-    revenue = count * 25
-    
-    # Active Barbers
-    barbers = session.exec(select(Barber).where(Barber.is_active == True)).all()
-    active_barbers = len(barbers)
-
-    return {
-        "total_bookings": count,
-        "revenue": revenue,
-        "active_barbers": active_barbers
-    }
+    # Served from the DailyStats rollup, never loads individual appointments
+    return summarize(session, parse_day(start_date), parse_day(end_date), by_barber)
 
 @app.post("/barber/toggle-status")
 def toggle_status(current_barber: Barber = Depends(get_current_barber), session: Session = Depends(get_session)):
-    current_barber.is_checked_in = not current_barber.is_checked_in
-    session.add(current_barber)
+    barber = session.get(Barber, current_barber.id)
+    barber.is_checked_in = not barber.is_checked_in
+    session.add(barber)
+    record_change(session, "barbers", barber.id)
     session.commit()
-    session.refresh(current_barber)
-    return {"status": "checked_in" if current_barber.is_checked_in else "checked_out"}
+    after_barber_change(barber.id)
+    return {"status": "checked_in" if barber.is_checked_in else "checked_out"}
 
 @app.get("/barber/dashboard-stats")
 def get_barber_stats(current_barber: Barber = Depends(get_current_barber), session: Session = Depends(get_session)):
-    # 1. Customers Served Today
-    today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-    
-    statement = select(Appointment).where(
-        Appointment.barber_id == current_barber.id,
-        Appointment.time_slot >= today_start
-    )
-    todays_appointments = session.exec(statement).all()
-    count = len(todays_appointments)
-    
-    # 2. Earnings
-    earnings = count * 25
-    
-    # 3. Queue Duration
+    # Today's counters are kept up to date by the booking hooks
     now = datetime.now()
-    future_appts = [a for a in todays_appointments if a.time_slot > now]
-    if future_appts:
-        last_appt_end = max([a.time_slot for a in future_appts]) + timedelta(minutes=30)
-        duration = (last_appt_end - now).seconds // 60
-    else:
-        duration = 0
-
-    return {
-        "customers_served_today": count,
-        "total_earned_today": earnings,
-        "queue_duration_minutes": duration,
-        "is_checked_in": current_barber.is_checked_in,
-        "name": current_barber.name
-    }
+    summary = dashboard_counters.summary(current_barber.id, now.date(), now, session)
+    return dashboard_stats(current_barber, summary)
 
 @app.delete("/appointments/{appt_id}")
 def delete_appointment(appt_id: int, session: Session = Depends(get_session)):
     # Public for now (Phase 1/2) - Ideally protect with get_current_admin later
-    appt = session.get(Appointment, appt_id)
+    # Listings include archived rows, so deleting works on them too (ids are
+    # unique across both tables)
+    appt = session.get(Appointment, appt_id) or session.get(ArchivedAppointment, appt_id)
     if not appt:
         raise HTTPException(status_code=404, detail="Appointment not found")
+    barber_id, time_slot, service_type = appt.barber_id, appt.time_slot, appt.service_type
     session.delete(appt)
+    record_booking(session, barber_id, time_slot, service_for(service_type).price, delta=-1)
+    record_change(session, "slots", barber_id, time_slot.date())
     session.commit()
+    after_cancellation(barber_id, time_slot, service_type)
     return {"message": "Deleted"}
@@ -0,0 +1,185 @@
+# backend/metrics.py
+# Per-request instrumentation: latency histograms and status counts per
+# route, SQL statement counts and DB time (from engine events), N+1 detection
+# and an optional slow-request log. Rendered as Prometheus text on /metrics.
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+
+logger = logging.getLogger("backend.metrics")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# The same SELECT this many times in one request is reported as an N+1
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+# Requests slower than this are logged with their statements (0 disables)
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "0"))
+
+# Collapses expanded IN (...) lists so they count as one statement shape
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+
+class RequestStats:
+    # Collected for the request in flight (shared with threadpool workers
+    # through the context variable below)
+    def __init__(self):
+        self.statements: List[Tuple[str, float]] = []
+        self.db_time = 0.0
+
+    def repeated_selects(self) -> List[Tuple[str, int]]:
+        shapes = Counter(_IN_LIST.sub("(?)", sql) for sql, _ in self.statements
+                         if sql.lstrip().upper().startswith("SELECT"))
+        return [(sql, n) for sql, n in shapes.items() if n >= N_PLUS_ONE_THRESHOLD]
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.statements.append((statement, elapsed))
+        stats.db_time += elapsed
+
+
+def instrument_engine(engine):
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class RouteMetrics:
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.statuses: Counter = Counter()
+        self.statements = 0
+        self.db_time = 0.0
+        self.n_plus_one = 0
+
+
+class RequestMetrics:
+    def __init__(self):
+        self._routes: Dict[Tuple[str, str], RouteMetrics] = {}
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._routes.clear()
+
+    def record(self, method: str, route: str, status: int, duration: float, stats: RequestStats, n_plus_one: bool):
+        with self._lock:
+            metrics = self._routes.get((method, route))
+            if metrics is None:
+                metrics = self._routes[(method, route)] = RouteMetrics()
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if duration <= bound:
+                    metrics.buckets[i] += 1
+                    break
+            metrics.count += 1
+            metrics.total += duration
+            metrics.statuses[status] += 1
+            metrics.statements += len(stats.statements)
+            metrics.db_time += stats.db_time
+            metrics.n_plus_one += n_plus_one
+
+    def render(self) -> str:
+        with self._lock:
+            routes = sorted(self._routes.items())
+            lines = [
+                "# HELP http_requests_total Requests by route and status.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route), m in routes:
+                for status, n in sorted(m.statuses.items()):
+                    lines.append(f'http_requests_total{{method="{method}",route="{route}",status="{status}"}} {n}')
+
+            lines += [
+                "# HELP http_request_duration_seconds Request latency by route.",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            for (method, route), m in routes:
+                labels = f'method="{method}",route="{route}"'
+                cumulative = 0
+                for bound, n in zip(LATENCY_BUCKETS, m.buckets):
+                    cumulative += n
+                    lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {m.count}')
+                lines.append(f"http_request_duration_seconds_sum{{{labels}}} {m.total:.6f}")
+                lines.append(f"http_request_duration_seconds_count{{{labels}}} {m.count}")
+
+            for name, kind, help_text, value in (
+                ("db_statements_total", "counter", "SQL statements executed by route.", lambda m: m.statements),
+                ("db_time_seconds_total", "counter", "Time spent in SQL statements by route.", lambda m: f"{m.db_time:.6f}"),
+                ("db_n_plus_one_total", "counter", "Requests with a repeated SELECT (likely N+1) by route.", lambda m: m.n_plus_one),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                for (method, route), m in routes:
+                    lines.append(f'{name}{{method="{method}",route="{route}"}} {value(m)}')
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+def format_samples(samples: Dict[str, Tuple[str, str, float]]) -> str:
+    # {name: (type, help, value)} -> Prometheus text, for unlabelled app metrics
+    lines = []
+    for name, (kind, help_text, value) in samples.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value}"]
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    # Plain ASGI middleware (rather than @app.middleware) so streaming
+    # responses are timed to their last byte
+    def __init__(self, app, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            duration = time.perf_counter() - start
+            # Label by route template, not the raw path, to keep cardinality bounded
+            route = getattr(scope.get("route"), "path", "unmatched")
+            repeated = stats.repeated_selects()
+            for sql, n in repeated:
+                logger.warning("Possible N+1 on %s %s: %d x %s", scope["method"], route, n, sql)
+            self.metrics.record(scope["method"], route, status, duration, stats, bool(repeated))
+
+            if SLOW_REQUEST_MS and duration * 1000 >= SLOW_REQUEST_MS:
+                logger.warning(
+                    "Slow request %s %s -> %d in %.1f ms (%d statements, %.1f ms in DB)\n%s",
+                    scope["method"], scope["path"], status, duration * 1000, len(stats.statements), stats.db_time * 1000,
+                    "\n".join(f"  {elapsed * 1000:7.2f} ms  {sql}" for sql, elapsed in stats.statements)
+                )
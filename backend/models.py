@@ -1,6 +1,6 @@
-from sqlmodel import SQLModel, Field
-from typing import Optional
-from datetime import datetime
+from sqlmodel import SQLModel, Field, Index
+from typing import List, Optional, Tuple
+from datetime import date, datetime
 
 class Barber(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -14,15 +14,118 @@ class Barber(SQLModel, table=True):
     is_active: bool = Field(default=True)
 
 class Appointment(SQLModel, table=True):
+    # One booking per barber per slot, enforced by the DB (see /book).
+    # AUTOINCREMENT so ids moved to ArchivedAppointment are never handed out again
+    __table_args__ = (
+        Index("ix_appointment_barber_slot", "barber_id", "time_slot", unique=True),
+        {"sqlite_autoincrement": True},
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     barber_id: int = Field(foreign_key="barber.id")
     customer_name: str
-    time_slot: datetime  # e.g., 2026-01-25 10:00:00
+    time_slot: datetime = Field(index=True)  # e.g., 2026-01-25 10:00:00
+    service_type: str = "Haircut"
+
+class ArchivedAppointment(SQLModel, table=True):
+    # Cold storage: bookings older than the archive horizon, moved here by
+    # backend/archive.py with their ids (DailyStats keeps their totals)
+    __table_args__ = (Index("ix_archivedappointment_barber_slot", "barber_id", "time_slot"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    barber_id: int = Field(foreign_key="barber.id")
+    customer_name: str
+    time_slot: datetime = Field(index=True)
     service_type: str = "Haircut"
 
 class Shift(SQLModel, table=True):
+    # Weekly working hours; several rows on one weekday make a split shift
+    __table_args__ = (Index("ix_shift_barber_weekday_start", "barber_id", "weekday", "start_hour", unique=True),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     barber_id: int = Field(foreign_key="barber.id")
     weekday: int  # 0=Monday, 6=Sunday
     start_hour: int # e.g., 9 for 09:00
     end_hour: int   # e.g., 17 for 17:00
+
+
+class ShiftOverride(SQLModel, table=True):
+    # Replaces the weekly shifts from start_date to end_date (inclusive):
+    # holidays, sick days, one-off hours. The newest override wins where
+    # ranges overlap.
+    __table_args__ = (Index("ix_shiftoverride_barber_start", "barber_id", "start_date"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    barber_id: int = Field(foreign_key="barber.id")
+    start_date: date
+    end_date: date
+    hours: str = ""  # e.g. "9-12,13-17"; empty = not working
+
+
+class DailyStats(SQLModel, table=True):
+    # Per barber per day rollup, maintained by /book and DELETE /appointments
+    barber_id: int = Field(foreign_key="barber.id", primary_key=True)
+    day: date = Field(primary_key=True, index=True)
+    bookings: int = 0
+    revenue: int = 0
+
+
+class SlotHold(SQLModel, table=True):
+    # "Reserved for 2 minutes while you fill the form", shared by every worker
+    # process (see backend/holds.py)
+    __table_args__ = (Index("ix_slothold_barber_start", "barber_id", "start"),)
+
+    id: str = Field(primary_key=True)  # uuid hex, handed to the customer
+    barber_id: int = Field(foreign_key="barber.id")
+    start: datetime
+    end: datetime
+    expires_at: datetime = Field(index=True)
+
+
+class ChangeLog(SQLModel, table=True):
+    # Written in the same transaction as each write, so every worker process
+    # can invalidate its in-memory caches (see backend/coherence.py)
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    seq: Optional[int] = Field(default=None, primary_key=True)
+    origin: str  # worker that made the change
+    resource: str  # "slots", "shifts", "barbers" or "holds"
+    barber_id: Optional[int] = None
+    day: Optional[date] = None
+
+
+# --- Request models ---
+
+class OverrideRequest(SQLModel):
+    # POST /shifts/overrides; hours=[] marks the days off
+    barber_id: int
+    start_date: date
+    end_date: date
+    hours: List[Tuple[int, int]] = []
+
+
+# --- Read models (response shapes; never expose hashed_password) ---
+
+class BarberCard(SQLModel):
+    # Public listing (/barbers)
+    id: int
+    name: str
+    photo_url: Optional[str] = None
+    is_checked_in: bool = False
+
+
+class BarberProfile(BarberCard):
+    # The logged-in barber (/users/me)
+    username: str
+    role: str
+    is_active: bool = True
+
+
+class AppointmentRow(SQLModel):
+    # One /appointments row; `fields=` can select a subset
+    id: Optional[int] = None
+    barber_id: Optional[int] = None
+    barber_name: Optional[str] = None
+    customer_name: Optional[str] = None
+    time_slot: Optional[datetime] = None
+    service_type: Optional[str] = None
@@ -0,0 +1,64 @@
+# backend/next_available.py
+# "Who can take me soonest?" - the earliest free start times across barbers.
+# Each barber gets a lazy generator of free starts (day by day, in order);
+# heapq.merge walks them together and we stop after `limit` results, so only
+# the days actually reached are ever loaded.
+import heapq
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Dict, Iterator, List, Tuple
+
+from sqlmodel import Session, select
+
+from backend.availability import availability_index, minute_of_day, DayIntervals
+from backend.holds import slot_holds
+from backend.models import Barber
+
+MAX_SEARCH_DAYS = 14
+
+
+class DayLoader:
+    # Loads a day for every searched barber at once (one Appointment query
+    # via load_range), the first time any barber reaches it
+    def __init__(self, barber_ids: List[int], session: Session):
+        self.barber_ids = barber_ids
+        self.session = session
+        self._days: Dict[Tuple[int, date], DayIntervals] = {}
+
+    def __call__(self, barber_id: int, day: date) -> DayIntervals:
+        intervals = self._days.get((barber_id, day))
+        if intervals is None:
+            intervals = availability_index.cached_day(barber_id, day)
+        if intervals is None:
+            self._days.update(availability_index.load_range(self.barber_ids, day, day, self.session))
+            intervals = self._days[(barber_id, day)]
+        return intervals
+
+
+def free_starts(barber_id: int, start: datetime, minutes: int, days: int, load_day) -> Iterator[Tuple[datetime, int]]:
+    # (start time, barber_id) for every free start from `start` on, in order
+    for offset in range(days):
+        day = start.date() + timedelta(days=offset)
+        busy = slot_holds.held_intervals(barber_id, day)
+        if offset == 0:
+            # Nothing before `start`; a barber who is free right now can start now
+            busy += ((0, minute_of_day(start)),)
+        midnight = datetime.combine(day, datetime.min.time())
+        for minute in load_day(barber_id, day).free_starts(minutes, busy):
+            yield midnight + timedelta(minutes=minute), barber_id
+
+
+def next_available(session: Session, start: datetime, minutes: int, limit: int,
+                   checked_in_only: bool = False, days: int = MAX_SEARCH_DAYS) -> List[dict]:
+    statement = select(Barber.id, Barber.name).where(Barber.is_active == True).order_by(Barber.id)
+    if checked_in_only:
+        statement = statement.where(Barber.is_checked_in == True)
+    barbers = dict(session.exec(statement).all())
+
+    load_day = DayLoader(list(barbers), session)
+    merged = heapq.merge(*(free_starts(barber_id, start, minutes, days, load_day) for barber_id in barbers))
+    return [
+        {"barber_id": barber_id, "barber_name": barbers[barber_id],
+         "date": when.date().isoformat(), "time": when.strftime("%H:%M")}
+        for when, barber_id in islice(merged, limit)
+    ]
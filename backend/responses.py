@@ -0,0 +1,74 @@
+# backend/responses.py
+# Fast JSON for the list endpoints. Handlers return a FastJSONResponse
+# directly, which skips FastAPI's per-row response validation and
+# jsonable_encoder; rows are plain dicts/tuples straight from the query.
+import os
+import threading
+from typing import Any, Callable, Optional, Tuple
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from sqlmodel import Session
+
+from backend.versions import resource_versions
+
+try:
+    import orjson
+except ImportError:  # optional: pydantic-core (a FastAPI dependency) is nearly as fast
+    orjson = None
+    import pydantic_core
+
+# Responses at least this large are gzipped for clients that accept it
+# (GZipMiddleware in main.py); 6 is most of level 9's ratio for far less CPU
+GZIP_MIN_SIZE = int(os.getenv("GZIP_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return pydantic_core.to_json(content)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def fast_json(content: Any, response: Response) -> FastJSONResponse:
+    # Returning a Response also bypasses the headers a handler set on the
+    # injected `response` (ETag, X-Next-Cursor...), so carry them over
+    fast = FastJSONResponse(content)
+    fast.headers.raw.extend(response.headers.raw)
+    return fast
+
+
+class SerializedCache:
+    # Serialized body of a rarely-changing collection (e.g. the barber list),
+    # rebuilt only when the resource's version moves (see backend/booking.py)
+    def __init__(self, resource: str, load: Callable[[Session], Any]):
+        self.resource = resource
+        self.load = load
+        self._entry: Optional[Tuple[Tuple[str, int], bytes]] = None
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._entry = None
+
+    def get(self, session: Session) -> bytes:
+        # Version read before loading: a change that races the load bumps it,
+        # so the next call rebuilds instead of serving stale bytes forever
+        version = (resource_versions.epoch, resource_versions.get(self.resource)[0])
+        with self._lock:
+            if self._entry is not None and self._entry[0] == version:
+                return self._entry[1]
+        body = dumps(self.load(session))
+        with self._lock:
+            self._entry = (version, body)
+        return body
+
+    def response(self, session: Session, response: Response) -> Response:
+        cached = Response(self.get(session), media_type="application/json")
+        cached.headers.raw.extend(response.headers.raw)
+        return cached
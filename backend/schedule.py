@@ -0,0 +1,181 @@
+# backend/schedule.py
+# Compiled working hours, so "when does barber X work on date D?" never
+# needs a query. Per barber: the weekly Shift rows (several per weekday make
+# a split shift) and the ShiftOverride date ranges (holidays, sick days,
+# one-off hours) painted into sorted, non-overlapping segments - a lookup is
+# one bisect. Loaded once (two queries), then patched one barber at a time
+# by the /shifts handlers (see backend/booking.py).
+import logging
+from bisect import bisect_right
+from datetime import date, timedelta
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlmodel import Session, select
+
+from backend.models import Shift, ShiftOverride
+from backend.write_guard import WriteGuard
+
+logger = logging.getLogger("backend.schedule")
+
+MINUTES_PER_DAY = 24 * 60
+
+# Minutes since midnight
+Interval = Tuple[int, int]
+Hours = Tuple[int, int]
+Windows = Tuple[Interval, ...]
+
+
+def shift_windows(start_hour: int, end_hour: int) -> Windows:
+    start, end = max(0, start_hour * 60), min(MINUTES_PER_DAY, end_hour * 60)
+    return ((start, end),) if end > start else ()
+
+
+def merge_windows(windows: Iterable[Interval]) -> Windows:
+    merged: List[Interval] = []
+    for start, end in sorted(windows):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+        else:
+            merged.append((start, end))
+    return tuple(merged)
+
+
+def hour_windows(hours: Iterable[Hours]) -> Windows:
+    return merge_windows(w for start, end in hours for w in shift_windows(start, end))
+
+
+def check_hours(hours: Sequence[Hours]):
+    # For the /shifts endpoints: whole hours, inside the day, no overlaps
+    previous_end = 0
+    for start, end in sorted(hours):
+        if not 0 <= start < end <= 24 or start < previous_end:
+            raise ValueError(f"Invalid shift hours {start}-{end}")
+        previous_end = end
+
+
+def format_hours(hours: Iterable[Hours]) -> str:
+    # Stored form of ShiftOverride.hours: "9-12,13-17", "" for a day off
+    return ",".join(f"{start}-{end}" for start, end in sorted(hours))
+
+
+def parse_hours(text: str) -> List[Hours]:
+    return [tuple(int(h) for h in part.split("-")) for part in text.split(",") if part]
+
+
+class BarberSchedule:
+    # Never mutated once built: the with_* methods return a new instance
+    __slots__ = ("weekly", "overrides", "starts", "ends", "windows_by_segment")
+
+    def __init__(self, weekly: Sequence[Windows] = ((),) * 7,
+                 overrides: Iterable[Tuple[int, date, date, Windows]] = ()):
+        self.weekly = tuple(weekly)
+        # (override_id, start_date, end_date, windows); a later id wins where
+        # ranges overlap
+        self.overrides = tuple(sorted(overrides, key=itemgetter(0)))
+        segments: List[Tuple[date, date, Windows]] = []
+        for _, start, end, windows in self.overrides:
+            kept = []
+            for s, e, w in segments:
+                if e < start or s > end:
+                    kept.append((s, e, w))
+                    continue
+                if s < start:
+                    kept.append((s, start - timedelta(days=1), w))
+                if e > end:
+                    kept.append((end + timedelta(days=1), e, w))
+            kept.append((start, end, windows))
+            segments = sorted(kept, key=itemgetter(0))
+        self.starts = tuple(s for s, _, _ in segments)
+        self.ends = tuple(e for _, e, _ in segments)
+        self.windows_by_segment = tuple(w for _, _, w in segments)
+
+    def windows(self, day: date) -> Windows:
+        i = bisect_right(self.starts, day) - 1
+        if i >= 0 and day <= self.ends[i]:
+            return self.windows_by_segment[i]
+        return self.weekly[day.weekday()]
+
+    def with_weekly(self, weekday: int, windows: Windows) -> "BarberSchedule":
+        weekly = list(self.weekly)
+        weekly[weekday] = windows
+        return BarberSchedule(weekly, self.overrides)
+
+    def with_override(self, override_id: int, start: date, end: date, windows: Windows) -> "BarberSchedule":
+        return BarberSchedule(self.weekly, self.without_override(override_id).overrides + ((override_id, start, end, windows),))
+
+    def without_override(self, override_id: int) -> "BarberSchedule":
+        return BarberSchedule(self.weekly, [o for o in self.overrides if o[0] != override_id])
+
+
+class ShiftSchedule(WriteGuard):
+    def __init__(self):
+        super().__init__()
+        self._barbers: Optional[Dict[int, BarberSchedule]] = None
+
+    def clear(self):
+        with self._writing():
+            self._barbers = None
+
+    def barbers(self, session: Session) -> Dict[int, BarberSchedule]:
+        # Every barber with at least one shift or override. The dict is
+        # replaced (never changed) by writers, so callers may keep it.
+        with self._lock:
+            if self._barbers is not None:
+                return self._barbers
+            token = self._load_token()
+
+        # Rows the /shifts endpoints would reject (older data, manual edits)
+        # are skipped rather than breaking every barber's schedule
+        weekly: Dict[int, List[List[Interval]]] = {}
+        for shift in session.exec(select(Shift)).all():
+            if not 0 <= shift.weekday <= 6:
+                logger.warning("Skipping shift %s with weekday %s", shift.id, shift.weekday)
+                continue
+            days = weekly.setdefault(shift.barber_id, [[] for _ in range(7)])
+            days[shift.weekday].extend(shift_windows(shift.start_hour, shift.end_hour))
+        overrides: Dict[int, list] = {}
+        for o in session.exec(select(ShiftOverride)).all():
+            try:
+                windows = hour_windows(parse_hours(o.hours))
+            except ValueError:
+                logger.warning("Skipping shift override %s with hours %r", o.id, o.hours)
+                continue
+            overrides.setdefault(o.barber_id, []).append((o.id, o.start_date, o.end_date, windows))
+
+        barbers = {
+            barber_id: BarberSchedule(
+                [merge_windows(days) for days in weekly[barber_id]] if barber_id in weekly else ((),) * 7,
+                overrides.get(barber_id, ()))
+            for barber_id in sorted(set(weekly) | set(overrides))
+        }
+        with self._lock:
+            if self._still_current(token):
+                self._barbers = barbers
+        return barbers
+
+    def windows(self, barber_id: int, day: date, session: Session) -> Windows:
+        schedule = self.barbers(session).get(barber_id)
+        return schedule.windows(day) if schedule is not None else ()
+
+    def _patch(self, barber_id: int, change) -> Optional[BarberSchedule]:
+        # The write hooks below return the barber's new schedule, or None
+        # when nothing is loaded yet
+        with self._writing():
+            if self._barbers is None:
+                return None
+            schedule = change(self._barbers.get(barber_id, BarberSchedule()))
+            self._barbers = {**self._barbers, barber_id: schedule}
+            return schedule
+
+    def set_weekly(self, barber_id: int, weekday: int, windows: Windows) -> Optional[BarberSchedule]:
+        return self._patch(barber_id, lambda s: s.with_weekly(weekday, windows))
+
+    def set_override(self, barber_id: int, override_id: int, start: date, end: date, windows: Windows) -> Optional[BarberSchedule]:
+        return self._patch(barber_id, lambda s: s.with_override(override_id, start, end, windows))
+
+    def remove_override(self, barber_id: int, override_id: int) -> Optional[BarberSchedule]:
+        return self._patch(barber_id, lambda s: s.without_override(override_id))
+
+
+shift_schedule = ShiftSchedule()
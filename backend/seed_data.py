@@ -1,7 +1,13 @@
 # backend/seed_data.py
-from sqlmodel import Session, select, SQLModel
-from backend.models import Barber, Shift, Appointment
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from sqlmodel import Session, select, SQLModel, insert
+from backend.models import Barber, Shift, Appointment, DailyStats
 from backend.database import engine, create_db_and_tables
+from backend.services import SERVICES
 
 # No need to recreate engine here, use the one from database.py
 
@@ -69,6 +75,140 @@ def seed_data():
         session.commit()
         print("✅ Success! Added 3 Barbers (with logins) and standard 9-5 Shifts.")
 
+# --- Synthetic data for performance testing ---
+# python -m backend.seed_data --barbers 50 --months 12
+# Everything goes through chunked core INSERTs (executemany) in a single
+# transaction, so millions of appointments take seconds rather than hours.
+
+# weekday -> (start_hour, end_hour); missing weekday = day off
+SHIFT_PATTERNS = {
+    "standard": {day: (9, 17) for day in range(7)},
+    "weekdays": {day: (9, 17) for day in range(5)},
+    "late": {day: (12, 20) for day in range(1, 7)},
+    "weekend": {day: (8, 18) for day in (3, 4, 5, 6)},
+}
+
+# Relative demand: Saturdays and Fridays are busiest, Mondays quietest; lunch
+# and after-work slots fill first.
+WEEKDAY_DEMAND = [0.55, 0.65, 0.7, 0.75, 0.9, 1.0, 0.6]
+HOUR_DEMAND = {8: 0.5, 9: 0.6, 10: 0.7, 11: 0.85, 12: 1.0, 13: 0.9, 14: 0.7,
+               15: 0.7, 16: 0.85, 17: 1.0, 18: 0.95, 19: 0.8}
+FIRST_NAMES = ["James", "Liam", "Noah", "Oliver", "Elijah", "Lucas", "Mason", "Ethan", "Aiden", "Leo",
+               "Mateo", "Omar", "Arjun", "Kenji", "Sofia", "Emma", "Mia", "Ava", "Zara", "Nina"]
+SERVICE_MIX = [("Haircut", 0.6), ("Beard Trim", 0.15), ("Haircut & Beard", 0.15), ("Cut & Color", 0.1)]
+CHUNK_SIZE = 10_000
+
+
+def shift_pattern_for(pattern: str, index: int):
+    # "mixed" rotates through every pattern so barbers differ
+    if pattern == "mixed":
+        names = sorted(SHIFT_PATTERNS)
+        return SHIFT_PATTERNS[names[index % len(names)]]
+    return SHIFT_PATTERNS[pattern]
+
+
+def generate_appointments(barber_ids, patterns, start: date, end: date, fill_rate: float, rng: random.Random):
+    # Yields non-overlapping appointment rows: walks each shift deciding at
+    # every 30-minute mark, or right after the previous appointment ends
+    service_names = [name for name, _ in SERVICE_MIX]
+    service_weights = [weight for _, weight in SERVICE_MIX]
+    today = date.today()
+    day = start
+    while day <= end:
+        # Future days are only partially booked yet
+        horizon = 1.0 if day <= today else max(0.1, 1 - (day - today).days / 14)
+        for barber_id, pattern in zip(barber_ids, patterns):
+            hours = pattern.get(day.weekday())
+            if not hours:
+                continue
+            minute, closing = hours[0] * 60, hours[1] * 60
+            while minute < closing:
+                p = fill_rate * horizon * WEEKDAY_DEMAND[day.weekday()] * HOUR_DEMAND.get(minute // 60, 0.5)
+                if rng.random() < p:
+                    service = rng.choices(service_names, service_weights)[0]
+                    if minute + SERVICES[service].minutes <= closing:
+                        yield {
+                            "barber_id": barber_id,
+                            "customer_name": f"{rng.choice(FIRST_NAMES)} {chr(65 + rng.randrange(26))}.",
+                            "time_slot": datetime.combine(day, datetime.min.time()) + timedelta(minutes=minute),
+                            "service_type": service,
+                        }
+                        minute += SERVICES[service].minutes
+                        continue
+                minute = (minute // 30 + 1) * 30
+        day += timedelta(days=1)
+
+
+def bulk_seed(barbers: int = 10, months: int = 6, future_days: int = 14, pattern: str = "mixed",
+              fill_rate: float = 0.6, seed: int = 42):
+    with Session(engine) as session:
+        if session.exec(select(Barber.id).limit(1)).first() is not None:
+            print("⚠️  Database already has data. Skipping bulk seed.")
+            return
+
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    pwd = get_password_hash("password")  # hashed once, shared by every generated barber
+    today = date.today()
+    start = today - timedelta(days=30 * months)
+    end = today + timedelta(days=future_days)
+
+    with engine.begin() as conn:
+        conn.execute(insert(Barber), [
+            {"name": f"Barber {i + 1}", "photo_url": f"https://i.pravatar.cc/150?u={i + 1}",
+             "username": f"barber{i + 1}", "hashed_password": pwd,
+             "role": "admin" if i == 0 else "barber", "is_checked_in": rng.random() < 0.5, "is_active": True}
+            for i in range(barbers)
+        ])
+        barber_ids = [row[0] for row in conn.execute(select(Barber.id).order_by(Barber.id))]
+        patterns = [shift_pattern_for(pattern, i) for i in range(barbers)]
+
+        conn.execute(insert(Shift), [
+            {"barber_id": barber_id, "weekday": weekday, "start_hour": hours[0], "end_hour": hours[1]}
+            for barber_id, shifts in zip(barber_ids, patterns)
+            for weekday, hours in shifts.items()
+        ])
+
+        # Appointments in chunks, building the daily rollup along the way
+        rollup = {}
+        total = 0
+        chunk = []
+        for row in generate_appointments(barber_ids, patterns, start, end, fill_rate, rng):
+            chunk.append(row)
+            key = (row["barber_id"], row["time_slot"].date())
+            bookings, revenue = rollup.get(key, (0, 0))
+            rollup[key] = (bookings + 1, revenue + SERVICES[row["service_type"]].price)
+            if len(chunk) >= CHUNK_SIZE:
+                conn.execute(insert(Appointment), chunk)
+                total += len(chunk)
+                chunk = []
+        if chunk:
+            conn.execute(insert(Appointment), chunk)
+            total += len(chunk)
+
+        # An empty executemany list would run a single INSERT with no values
+        if rollup:
+            conn.execute(insert(DailyStats), [
+                {"barber_id": barber_id, "day": day, "bookings": bookings, "revenue": revenue}
+                for (barber_id, day), (bookings, revenue) in rollup.items()
+            ])
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ Added {barbers} barbers and {total} appointments ({start} to {end}) in {elapsed:.1f}s.")
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed the database. With no options, adds the 3 demo barbers.")
+    parser.add_argument("--barbers", type=int, help="generate this many barbers plus appointment history")
+    parser.add_argument("--months", type=int, default=6, help="months of appointment history")
+    parser.add_argument("--future-days", type=int, default=14, help="days of upcoming bookings")
+    parser.add_argument("--pattern", default="mixed", choices=sorted(SHIFT_PATTERNS) + ["mixed"])
+    parser.add_argument("--fill-rate", type=float, default=0.6, help="peak-slot booking probability")
+    parser.add_argument("--seed", type=int, default=42, help="random seed (same seed, same data)")
+    args = parser.parse_args()
+
     create_db_and_tables() # Uncomment if you need to create tables from scratch
-    seed_data()
\ No newline at end of file
+    if args.barbers:
+        bulk_seed(args.barbers, args.months, args.future_days, args.pattern, args.fill_rate, args.seed)
+    else:
+        seed_data()
\ No newline at end of file
@@ -0,0 +1,25 @@
+# backend/services.py
+# Service catalog: how long each service takes and what it costs.
+# Appointment.service_type stores the catalog name; durations and prices are
+# looked up here, so availability, booking, stats and the dashboard agree.
+from typing import NamedTuple
+
+
+class Service(NamedTuple):
+    minutes: int
+    price: int
+
+
+SERVICES = {
+    "Beard Trim": Service(minutes=15, price=15),
+    "Haircut": Service(minutes=30, price=25),
+    "Haircut & Beard": Service(minutes=45, price=35),
+    "Cut & Color": Service(minutes=90, price=70),
+}
+DEFAULT_SERVICE = "Haircut"
+LONGEST_SERVICE_MINUTES = max(service.minutes for service in SERVICES.values())
+
+
+def service_for(name: str) -> Service:
+    # Names that are no longer in the catalog count as the default service
+    return SERVICES.get(name, SERVICES[DEFAULT_SERVICE])
@@ -0,0 +1,132 @@
+# backend/static_assets.py
+# static/ served from memory, compressed once at startup: gzip (plus brotli
+# when the optional `brotli` package is installed), picked per request by
+# Accept-Encoding. Every asset gets a strong content-hash ETag, and the
+# CSS/JS references inside the HTML pages are rewritten to versioned URLs
+# (style.css?v=<hash>) that can be cached for a year; the pages themselves
+# are revalidated, which is a cheap 304 while nothing changed. Edits to
+# static/ are picked up on restart.
+import gzip
+import hashlib
+import mimetypes
+import os
+import posixpath
+import re
+from typing import Dict
+
+from fastapi import Request, Response
+from fastapi.staticfiles import StaticFiles
+
+from backend.versions import not_modified
+
+try:
+    import brotli
+except ImportError:  # optional: gzip alone is understood by every browser
+    brotli = None
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+# Smaller files gain nothing from compression
+MIN_COMPRESS_SIZE = 256
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+# Relative href/src attributes (no scheme, query or fragment)
+_LOCAL_REF = re.compile(r'\b(href|src)="([^"?#:]+)"')
+
+
+def compressed_bodies(body: bytes) -> Dict[str, bytes]:
+    # Encodings in order of preference; only kept when they actually shrink it
+    bodies = {}
+    if brotli is not None:
+        bodies["br"] = brotli.compress(body, quality=11)
+    bodies["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+    return {encoding: data for encoding, data in bodies.items() if len(data) < len(body)}
+
+
+def accepted_encodings(header: str) -> set:
+    accepted = set()
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip().lower())
+    return accepted
+
+
+class Asset:
+    __slots__ = ("media_type", "hash", "modified", "bodies")
+
+    def __init__(self, media_type: str, body: bytes, modified: float):
+        self.media_type = media_type
+        self.hash = hashlib.sha256(body).hexdigest()[:16]
+        self.modified = modified
+        self.bodies = {}
+        if len(body) >= MIN_COMPRESS_SIZE and media_type.startswith(COMPRESSIBLE_TYPES):
+            self.bodies = compressed_bodies(body)
+        self.bodies["identity"] = body
+
+    def response(self, request: Request) -> Response:
+        accepted = accepted_encodings(request.headers.get("accept-encoding", ""))
+        encoding = next(e for e in self.bodies if e == "identity" or e in accepted)
+        headers = {"Vary": "Accept-Encoding"}
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        response = Response(self.bodies[encoding], media_type=self.media_type, headers=headers)
+
+        # Each encoding is a different representation, so a different strong tag
+        etag = f'"{self.hash}"' if encoding == "identity" else f'"{self.hash}-{encoding}"'
+        versioned = request.query_params.get("v") == self.hash
+        cache_control = IMMUTABLE_CACHE_CONTROL if versioned else REVALIDATE_CACHE_CONTROL
+        return not_modified(request, response, (etag, self.modified), cache_control) or response
+
+
+def versioned_refs(html: bytes, name: str, hashes: Dict[str, str]) -> bytes:
+    base = posixpath.dirname(name)
+
+    def replace(match):
+        attr, ref = match.groups()
+        target = posixpath.normpath(posixpath.join(base, ref))
+        if target not in hashes or target.endswith(".html"):
+            return match.group(0)
+        return f'{attr}="{ref}?v={hashes[target]}"'
+
+    return _LOCAL_REF.sub(replace, html.decode()).encode()
+
+
+def load_assets(directory: str) -> Dict[str, Asset]:
+    files = {}
+    for root, _, names in os.walk(directory):
+        for file_name in names:
+            path = os.path.join(root, file_name)
+            name = os.path.relpath(path, directory).replace(os.sep, "/")
+            with open(path, "rb") as f:
+                files[name] = (f.read(), os.stat(path).st_mtime)
+
+    hashes = {name: hashlib.sha256(body).hexdigest()[:16] for name, (body, _) in files.items()}
+    latest = max((modified for _, modified in files.values()), default=0)
+    assets = {}
+    for name, (body, modified) in files.items():
+        media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        if media_type == "text/html":
+            # The page changes whenever an asset it references does
+            body, modified = versioned_refs(body, name, hashes), latest
+        assets[name] = Asset(media_type, body, modified)
+    return assets
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    # Files added after startup still work, through plain StaticFiles
+    def __init__(self, *, directory: str, **kwargs):
+        super().__init__(directory=directory, **kwargs)
+        self.assets = load_assets(directory)
+
+    async def get_response(self, path: str, scope) -> Response:
+        asset = self.assets.get(path.replace(os.sep, "/"))
+        if asset is None or scope["method"] not in ("GET", "HEAD"):
+            return await super().get_response(path, scope)
+        return asset.response(Request(scope))
@@ -0,0 +1,84 @@
+# backend/stats.py
+# Daily bookings/revenue rollup so /admin/stats never has to load appointments.
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, func, select, delete
+
+from backend.models import Appointment, ArchivedAppointment, Barber, DailyStats
+from backend.services import service_for
+
+
+def daily_stats_upsert(barber_id: int, time_slot: datetime, price: int, delta: int = 1):
+    revenue = delta * price
+    return sqlite_insert(DailyStats).values(
+        barber_id=barber_id, day=time_slot.date(), bookings=delta, revenue=revenue
+    ).on_conflict_do_update(
+        index_elements=["barber_id", "day"],
+        set_={"bookings": DailyStats.bookings + delta, "revenue": DailyStats.revenue + revenue}
+    )
+
+
+def record_booking(session: Session, barber_id: int, time_slot: datetime, price: int, delta: int = 1):
+    # Upsert into the rollup inside the caller's transaction, so the rollup
+    # commits (or rolls back) together with the appointment itself.
+    session.execute(daily_stats_upsert(barber_id, time_slot, price, delta))
+
+
+def rebuild_daily_stats(session: Session):
+    # From both the live and the archived appointments (backend/archive.py)
+    totals = {}
+    for model in (Appointment, ArchivedAppointment):
+        day = func.date(model.time_slot)
+        rows = session.exec(
+            select(model.barber_id, day, model.service_type, func.count())
+            .group_by(model.barber_id, day, model.service_type)
+        ).all()
+        for barber_id, d, service, count in rows:
+            bookings, revenue = totals.get((barber_id, d), (0, 0))
+            totals[(barber_id, d)] = (bookings + count, revenue + count * service_for(service).price)
+    session.exec(delete(DailyStats))
+    session.add_all([
+        DailyStats(barber_id=barber_id, day=date.fromisoformat(d), bookings=bookings, revenue=revenue)
+        for (barber_id, d), (bookings, revenue) in totals.items()
+    ])
+    session.commit()
+
+
+def backfill_daily_stats(session: Session):
+    # Fills the rollup for databases created before it existed
+    has_rollup = session.exec(select(DailyStats.barber_id).limit(1)).first() is not None
+    has_appointments = any(
+        session.exec(select(model.id).limit(1)).first() is not None
+        for model in (Appointment, ArchivedAppointment)
+    )
+    if has_appointments and not has_rollup:
+        rebuild_daily_stats(session)
+
+
+def summarize(session: Session, start: Optional[date] = None, end: Optional[date] = None, by_barber: bool = False):
+    statement = select(
+        DailyStats.barber_id, func.sum(DailyStats.bookings), func.sum(DailyStats.revenue)
+    ).group_by(DailyStats.barber_id)
+    if start:
+        statement = statement.where(DailyStats.day >= start)
+    if end:
+        statement = statement.where(DailyStats.day <= end)
+    per_barber = session.exec(statement).all()
+
+    active_barbers = session.exec(
+        select(func.count()).select_from(Barber).where(Barber.is_active == True)
+    ).one()
+
+    result = {
+        "total_bookings": sum(bookings for _, bookings, _ in per_barber),
+        "revenue": sum(revenue for _, _, revenue in per_barber),
+        "active_barbers": active_barbers
+    }
+    if by_barber:
+        result["barbers"] = [
+            {"barber_id": barber_id, "bookings": bookings, "revenue": revenue}
+            for barber_id, bookings, revenue in per_barber
+        ]
+    return result
@@ -0,0 +1,111 @@
+# backend/versions.py
+# Per-resource version counters behind the ETag / Last-Modified headers on
+# /barbers, /slots and /appointments. Writes bump the counters (see
+# backend/booking.py); a matching If-None-Match gets a 304 without touching
+# the DB or serializing anything. The tags are weak: GZipMiddleware may
+# compress the same body (static/ instead tags each encoding strongly, see
+# backend/static_assets.py).
+import threading
+import time
+import uuid
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from fastapi import Request, Response
+
+# is_checked_in changes all day (walk-ins rely on it), so always revalidate
+BARBERS_CACHE_CONTROL = "public, no-cache"
+SLOTS_CACHE_CONTROL = "public, no-cache"
+APPOINTMENTS_CACHE_CONTROL = "private, no-cache"
+
+
+class ResourceVersions:
+    def __init__(self):
+        self._versions: Dict[Tuple, Tuple[int, float]] = {}
+        # Counters live in memory, so tags carry a per-process epoch: a
+        # restart can never hand out an old tag for different content.
+        self.epoch = uuid.uuid4().hex[:8]
+        self._started = time.time()
+        self._lock = threading.Lock()
+
+    def clear(self):
+        with self._lock:
+            self._versions.clear()
+
+    def restart(self):
+        # As if the process had restarted: for when changes may have been
+        # missed (see backend/coherence.py)
+        with self._lock:
+            self._versions.clear()
+            self.epoch = uuid.uuid4().hex[:8]
+            self._started = time.time()
+
+    def bump(self, *key):
+        with self._lock:
+            version, _ = self._versions.get(key, (0, self._started))
+            self._versions[key] = (version + 1, time.time())
+
+    def get(self, *key) -> Tuple[int, float]:
+        # (version, last modified timestamp)
+        with self._lock:
+            return self._versions.get(key, (0, self._started))
+
+
+resource_versions = ResourceVersions()
+
+
+def barbers_tag():
+    version, modified = resource_versions.get("barbers")
+    return f'W/"{resource_versions.epoch}-b{version}"', modified
+
+
+def slots_tag(barber_id: int, day, held: tuple, minutes: int):
+    # A day's slots depend on the barber's shifts, that day's bookings, any
+    # holds (which can also expire on their own, hence the holds themselves)
+    # and the length of the requested service
+    shift_version, shift_modified = resource_versions.get("shifts", barber_id)
+    day_version, day_modified = resource_versions.get("slots", barber_id, day)
+    held_hash = hash(held) & 0xFFFFFFFF if held else 0
+    return f'W/"{resource_versions.epoch}-s{shift_version}-d{day_version}-h{held_hash:x}-m{minutes}"', max(shift_modified, day_modified)
+
+
+def appointments_tag():
+    version, modified = resource_versions.get("appointments")
+    return f'W/"{resource_versions.epoch}-a{version}"', modified
+
+
+def opaque_tag(etag: str) -> str:
+    # If-None-Match uses the weak comparison: W/"x" matches "x"
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def not_modified(request: Request, response: Response, tag: Tuple[str, float], cache_control: str) -> Optional[Response]:
+    # Sets the validators on the response; returns a 304 if the client's copy is current
+    etag, modified = tag
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(modified, usegmt=True),
+        "Cache-Control": cache_control,
+    }
+    response.headers.update(headers)
+    # A 304 carries the same Vary as the 200 it revalidates (compressed or not)
+    headers["Vary"] = "Accept-Encoding"
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if opaque_tag(etag) in [opaque_tag(t) for t in if_none_match.split(",")] or if_none_match.strip() == "*":
+            return Response(status_code=304, headers=headers)
+        return None
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return None
+        # Last-Modified only has second resolution, so only answer 304 when the
+        # last change is strictly older than the client's copy
+        if modified < since:
+            return Response(status_code=304, headers=headers)
+    return None
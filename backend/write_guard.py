@@ -0,0 +1,28 @@
+# backend/write_guard.py
+# Base for the in-process caches that read the DB outside their lock
+# (availability index, dashboard counters, shift schedule). Write hooks run
+# inside _writing(), after the DB commit; a load takes _load_token() before
+# reading and keeps its result only if _still_current(token), so a load that
+# raced with a write can't put the pre-write state back.
+import threading
+from contextlib import contextmanager
+
+
+class WriteGuard:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    @contextmanager
+    def _writing(self):
+        with self._lock:
+            self._writes += 1
+            yield
+
+    def _load_token(self) -> int:
+        # Caller holds the lock
+        return self._writes
+
+    def _still_current(self, token: int) -> bool:
+        # Caller holds the lock
+        return self._writes == token
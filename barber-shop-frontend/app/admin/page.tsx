@@ -22,6 +22,7 @@ export default function AdminPage() {
     // Dashboard Data
     const [stats, setStats] = useState({ total_bookings: 0, revenue: 0, active_barbers: 0 })
     const [bookings, setBookings] = useState<any[]>([])
+    const [bookingsCursor, setBookingsCursor] = useState<string | null>(null)
     const [barbers, setBarbers] = useState<any[]>([])
 
     // Shift Form State
@@ -45,8 +46,9 @@ export default function AdminPage() {
             const statsData = await fetchStats()
             setStats(statsData)
 
-            const bookingsData = await fetchAppointments()
-            setBookings(bookingsData)
+            const bookingsPage = await fetchAppointments()
+            setBookings(bookingsPage.appointments)
+            setBookingsCursor(bookingsPage.nextCursor)
 
             const barbersData = await fetchBarbers()
             setBarbers(barbersData)
@@ -56,6 +58,17 @@ export default function AdminPage() {
         }
     }
 
+    const loadMoreBookings = async () => {
+        if (!bookingsCursor) return
+        try {
+            const bookingsPage = await fetchAppointments(bookingsCursor)
+            setBookings((loaded) => [...loaded, ...bookingsPage.appointments])
+            setBookingsCursor(bookingsPage.nextCursor)
+        } catch (error) {
+            toast({ title: "Error", description: "Failed to load more bookings", variant: "destructive" })
+        }
+    }
+
     const handleLogin = async () => {
         setIsLoading(true)
         setError("") // Clear previous errors
@@ -225,6 +238,13 @@ export default function AdminPage() {
                                     )}
                                 </TableBody>
                             </Table>
+                            {bookingsCursor && (
+                                <div className="flex justify-center pt-4">
+                                    <Button variant="outline" onClick={loadMoreBookings}>
+                                        Load more
+                                    </Button>
+                                </div>
+                            )}
                         </CardContent>
                     </Card>
                 </TabsContent>
@@ -14,7 +14,7 @@ import { Label } from '@/components/ui/label'
 import { Calendar } from '@/components/ui/calendar'
 import { Avatar, AvatarImage, AvatarFallback } from '@/components/ui/avatar'
 import { Spinner } from '@/components/ui/spinner'
-import { fetchBarbers, fetchSlots, submitBooking, type Barber, type BookingPayload } from '@/lib/api'
+import { fetchBarbers, fetchSlots, subscribeSlots, submitBooking, type Barber, type BookingPayload } from '@/lib/api'
 import { format } from 'date-fns'
 import { CheckCircle2 } from 'lucide-react'
 import type { Service } from '@/components/service-card'
@@ -61,9 +61,19 @@ export function BookingModal({ open, onOpenChange, selectedService }: BookingMod
       setIsLoadingSlots(true)
       setSelectedSlot(null)
       const dateStr = format(selectedDate, 'yyyy-MM-dd')
+      // Subscribe first so nothing booked during the fetch is missed
+      // Services have different lengths, so one booking can hide several start
+      // times: refetch the (cheap, cached) list on any change
+      const unsubscribe = subscribeSlots(selectedBarber.id, dateStr, () => {
+        fetchSlots(selectedBarber.id, dateStr).then((slots) => {
+          setAvailableSlots(slots)
+          setSelectedSlot((slot) => (slot && slots.includes(slot) ? slot : null))
+        })
+      })
       fetchSlots(selectedBarber.id, dateStr)
         .then(setAvailableSlots)
         .finally(() => setIsLoadingSlots(false))
+      return unsubscribe
     }
   }, [selectedBarber, selectedDate])
 
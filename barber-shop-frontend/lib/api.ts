@@ -1,4 +1,5 @@
 // lib/api.ts
+import { format } from "date-fns"
 
 export const BASE_URL = "http://localhost:8000"
 
@@ -77,6 +78,25 @@ export async function fetchSlots(barberId: number, date: string): Promise<string
   return response.json()
 }
 
+export interface SlotEvent {
+  // slot-changed: another server process changed the day (no time/minutes)
+  type: 'slot-taken' | 'slot-freed' | 'slot-changed' | 'shift-changed'
+  barber_id: number
+  date?: string
+  time?: string
+  minutes?: number
+}
+
+// Live slot updates (server-sent events) instead of refetching /slots
+export function subscribeSlots(barberId: number, date: string, onEvent: (event: SlotEvent) => void): () => void {
+  const source = new EventSource(`${BASE_URL}/events?barber_id=${barberId}&date=${date}`)
+  const handler = (e: MessageEvent) => onEvent(JSON.parse(e.data))
+  for (const type of ['slot-taken', 'slot-freed', 'slot-changed', 'shift-changed']) {
+    source.addEventListener(type, handler as EventListener)
+  }
+  return () => source.close()
+}
+
 export async function submitBooking(payload: BookingPayload): Promise<{ success: boolean; message: string }> {
   try {
     // UPDATED: Sending as JSON body is cleaner than query parameters
@@ -106,12 +126,25 @@ function getAuthHeaders(): Record<string, string> {
 
 // --- ADMIN FUNCTIONS (New) ---
 
-export async function fetchAppointments(): Promise<Appointment[]> {
-  const res = await fetch(`${BASE_URL}/appointments`, { // Endpoint was /appointments not /admin/appointments
+// One page per request; the dashboard asks for the next one on demand
+export const APPOINTMENTS_PAGE_SIZE = 100
+
+export interface AppointmentPage {
+  appointments: Appointment[]
+  nextCursor: string | null  // null on the last page
+}
+
+export async function fetchAppointments(cursor: string | null = null): Promise<AppointmentPage> {
+  // Today onwards (local date: toISOString() is the UTC date, already tomorrow
+  // on evenings west of UTC). The cursor only marks the position, so the
+  // filters go along with it.
+  const params = new URLSearchParams({ start_date: format(new Date(), "yyyy-MM-dd"), limit: String(APPOINTMENTS_PAGE_SIZE) })
+  if (cursor) params.set("cursor", cursor)
+  const res = await fetch(`${BASE_URL}/appointments?${params}`, {
     headers: { ...getAuthHeaders() }
   })
   if (!res.ok) throw new Error("Failed to fetch appointments")
-  return res.json()
+  return { appointments: await res.json(), nextCursor: res.headers.get("X-Next-Cursor") }
 }
 
 export async function cancelAppointment(appointmentId: number) {
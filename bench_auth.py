@@ -0,0 +1,49 @@
+# Benchmark: authenticated request latency with and without the token cache.
+# Runs in-process against a throwaway database: python bench_auth.py
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from backend.auth import create_access_token, token_cache
+from backend.database import engine
+from backend.main import app
+from backend.models import Barber
+
+REQUESTS = 2000
+
+
+def measure(client, headers):
+    latencies = []
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        client.get("/users/me", headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return statistics.mean(latencies), latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.95)]
+
+
+def run_benchmark():
+    engine.echo = False
+    with TestClient(app) as client:
+        with Session(engine) as session:
+            session.add(Barber(name="Bench", username="bench", hashed_password="x"))
+            session.commit()
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': 'bench'})}"}
+
+        for enabled in (False, True):
+            token_cache.enabled = enabled
+            token_cache.clear()
+            mean, p50, p95 = measure(client, headers)
+            label = "with cache" if enabled else "no cache"
+            print(f"{label:>10}: mean {mean:.3f} ms  p50 {p50:.3f} ms  p95 {p95:.3f} ms")
+        print(f"cache counters: {token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
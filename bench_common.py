@@ -0,0 +1,116 @@
+# Shared helpers for the bench_*.py scripts: an in-process ASGI client (no
+# network, no extra dependencies) and latency summaries.
+import asyncio
+import json
+import os
+import tempfile
+from urllib.parse import urlencode
+
+
+def use_temp_database(name="bench.db"):
+    # Must run before anything imports backend.database
+    os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), name))
+
+
+class AsgiClient:
+    def __init__(self, app):
+        self.app = app
+        self._lifespan = None
+        self._startup = None
+        self._shutdown = None
+
+    async def __aenter__(self):
+        self._startup = asyncio.Queue()
+        self._shutdown = asyncio.Queue()
+        await self._startup.put({"type": "lifespan.startup"})
+        sent = asyncio.Queue()
+
+        async def receive():
+            message = await self._startup.get()
+            return message
+
+        self._lifespan = asyncio.create_task(self.app({"type": "lifespan", "asgi": {"version": "3.0"}}, receive, sent.put))
+        message = await sent.get()
+        if message["type"] != "lifespan.startup.complete":
+            raise RuntimeError(f"App startup failed: {message}")
+        self._sent = sent
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._startup.put({"type": "lifespan.shutdown"})
+        await self._sent.get()
+        await self._lifespan
+
+    async def request(self, method, path, params=None, headers=None, data=None, json_body=None):
+        headers = dict(headers or {})
+        body = b""
+        if data is not None:
+            body = urlencode(data).encode()
+            headers["content-type"] = "application/x-www-form-urlencoded"
+        elif json_body is not None:
+            body = json.dumps(json_body).encode()
+            headers["content-type"] = "application/json"
+        headers["content-length"] = str(len(body))
+
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": urlencode(params or {}, doseq=True).encode(),
+            "root_path": "",
+            "headers": [(k.lower().encode(), str(v).encode()) for k, v in headers.items()],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+        done = asyncio.Event()
+        request_sent = False
+        response = {"status": None, "headers": {}, "body": []}
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = {k.decode(): v.decode() for k, v in message.get("headers", [])}
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+                if not message.get("more_body"):
+                    done.set()
+
+        await self.app(scope, receive, send)
+        done.set()
+        return response["status"], response["headers"], b"".join(response["body"])
+
+    async def get(self, path, **kwargs):
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path, **kwargs):
+        return await self.request("POST", path, **kwargs)
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize_latencies(latencies_ms, elapsed_s):
+    values = sorted(latencies_ms)
+    return {
+        "requests": len(values),
+        "throughput_rps": round(len(values) / elapsed_s, 1) if elapsed_s else 0.0,
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+    }
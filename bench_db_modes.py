@@ -0,0 +1,76 @@
+# Benchmark: requests/sec at high concurrency for DB_MODE=sync vs DB_MODE=async.
+# Each mode runs in its own process (the mode is read at import time):
+#   python bench_db_modes.py
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_common import AsgiClient, summarize_latencies
+
+CONCURRENCY = 200
+REQUESTS_PER_ENDPOINT = 500
+DATE = "2026-02-02"
+
+
+async def drive(client, method, path, make_kwargs):
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies = []
+
+    async def one(i):
+        async with semaphore:
+            start = time.perf_counter()
+            await client.request(method, path, **make_kwargs(i))
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(REQUESTS_PER_ENDPOINT)))
+    return summarize_latencies(latencies, time.perf_counter() - start)
+
+
+async def run_mode():
+    from sqlmodel import Session
+    from backend.auth import create_access_token
+    from backend.database import engine
+    from backend.main import app
+    from backend.models import Barber, Shift
+
+    engine.echo = False
+    results = {}
+    async with AsgiClient(app) as client:
+        with Session(engine) as session:
+            barbers = [Barber(name=f"B{i}", username=f"b{i}", hashed_password="x") for i in range(10)]
+            session.add_all(barbers)
+            session.commit()
+            session.add_all([Shift(barber_id=b.id, weekday=d, start_hour=0, end_hour=24) for b in barbers for d in range(7)])
+            session.commit()
+            ids = [b.id for b in barbers]
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': 'b0'})}"}
+
+        results["/book"] = await drive(client, "POST", "/book", lambda i: {"params": {
+            "barber_id": ids[i % 10], "date": f"2026-02-{1 + (i // 480) % 28:02d}",
+            "time": f"{(i // 10) % 48 // 2:02d}:{(i // 10) % 2 * 30:02d}", "name": "C"}})
+        results["/slots"] = await drive(client, "GET", "/slots", lambda i: {"params": {"barber_id": ids[i % 10], "date": DATE}})
+        results["/barber/dashboard-stats"] = await drive(client, "GET", "/barber/dashboard-stats", lambda i: {"headers": headers})
+        results["/appointments"] = await drive(client, "GET", "/appointments", lambda i: {})
+    return results
+
+
+def run_benchmark():
+    for mode in ("sync", "async"):
+        env = dict(os.environ, DB_MODE=mode, DATABASE_URL="sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+        out = subprocess.run([sys.executable, __file__, "--child"], env=env, capture_output=True, text=True, check=True)
+        results = json.loads(out.stdout.strip().splitlines()[-1])
+        print(f"DB_MODE={mode} (concurrency {CONCURRENCY})")
+        for path, r in results.items():
+            print(f"  {path:<26} {r['throughput_rps']:8.1f} req/s  p50 {r['p50_ms']:8.2f} ms  p99 {r['p99_ms']:8.2f} ms")
+
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        print(json.dumps(asyncio.run(run_mode())))
+    else:
+        run_benchmark()
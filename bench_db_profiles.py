@@ -0,0 +1,86 @@
+# Benchmark: mixed read/write throughput (slot/stat reads vs. bookings) under
+# each DB_PROFILE. Each profile runs in its own process:
+#   python bench_db_profiles.py
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_common import AsgiClient, summarize_latencies
+
+CONCURRENCY = 50
+OPERATIONS = 3000
+WRITE_EVERY = 5  # 1 booking per 4 reads
+BARBERS = 10
+
+
+async def run_profile():
+    from sqlmodel import Session
+    from backend.auth import create_access_token
+    from backend.availability import availability_index
+    from backend.database import engine
+    from backend.main import app
+    from backend.models import Barber, Shift
+
+    async with AsgiClient(app) as client:
+        with Session(engine) as session:
+            barbers = [Barber(name=f"B{i}", username=f"b{i}", hashed_password="x") for i in range(BARBERS)]
+            session.add_all(barbers)
+            session.commit()
+            session.add_all([Shift(barber_id=b.id, weekday=d, start_hour=0, end_hour=24) for b in barbers for d in range(7)])
+            session.commit()
+            ids = [b.id for b in barbers]
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': 'b0'})}"}
+
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+        reads, writes = [], []
+
+        async def operation(i):
+            async with semaphore:
+                start = time.perf_counter()
+                if i % WRITE_EVERY == 0:
+                    n = i // WRITE_EVERY
+                    await client.post("/book", params={
+                        "barber_id": ids[n % BARBERS], "date": f"2026-03-{1 + (n // (BARBERS * 48)) % 28:02d}",
+                        "time": f"{(n // BARBERS) % 48 // 2:02d}:{(n // BARBERS) % 2 * 30:02d}", "name": "C"})
+                    writes.append((time.perf_counter() - start) * 1000)
+                else:
+                    if i % 3 == 0:
+                        # Force the /slots read through to the DB
+                        availability_index.clear()
+                        await client.get("/slots", params={"barber_id": ids[i % BARBERS], "date": "2026-03-02"})
+                    elif i % 3 == 1:
+                        await client.get("/barber/dashboard-stats", headers=headers)
+                    else:
+                        await client.get("/admin/stats")
+                    reads.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(operation(i) for i in range(OPERATIONS)))
+        elapsed = time.perf_counter() - start
+    return {
+        "total_ops_per_s": round(OPERATIONS / elapsed, 1),
+        "reads": summarize_latencies(reads, elapsed),
+        "writes": summarize_latencies(writes, elapsed),
+    }
+
+
+def run_benchmark():
+    for profile in ("dev", "production"):
+        env = dict(os.environ, DB_PROFILE=profile, DATABASE_URL="sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+        out = subprocess.run([sys.executable, __file__, "--child"], env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True)
+        r = json.loads(out.stdout.strip().splitlines()[-1])
+        print(f"DB_PROFILE={profile}: {r['total_ops_per_s']} ops/s (concurrency {CONCURRENCY})")
+        for kind in ("reads", "writes"):
+            k = r[kind]
+            print(f"  {kind:<6} {k['requests']:5d}  p50 {k['p50_ms']:8.2f} ms  p95 {k['p95_ms']:8.2f} ms  p99 {k['p99_ms']:8.2f} ms")
+
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        print(json.dumps(asyncio.run(run_profile())))
+    else:
+        run_benchmark()
@@ -0,0 +1,63 @@
+# Benchmark: concurrent /login burst (e.g. shift change) against the login pool.
+# Runs in-process against a throwaway database: python bench_login.py
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+import backend.auth
+from backend.auth import get_password_hash, LOGIN_QUEUE_SIZE
+from backend.database import engine
+from backend.main import app
+from backend.models import Barber
+
+BARBERS = 50
+CONCURRENT_CLIENTS = 50
+LOGINS_PER_CLIENT = 4
+
+
+def burst(client):
+    def one_client(i):
+        results = []
+        for _ in range(LOGINS_PER_CLIENT):
+            start = time.perf_counter()
+            r = client.post("/login", data={"username": f"barber{i % BARBERS}", "password": "password"})
+            results.append((r.status_code, (time.perf_counter() - start) * 1000))
+        return results
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CONCURRENT_CLIENTS) as pool:
+        results = [r for rs in pool.map(one_client, range(CONCURRENT_CLIENTS)) for r in rs]
+    elapsed = time.perf_counter() - start
+
+    ok = sorted(ms for code, ms in results if code == 200)
+    rejected = sum(1 for code, _ in results if code == 429)
+    return len(results) / elapsed, ok, rejected
+
+
+def run_benchmark():
+    engine.echo = False
+    with TestClient(app) as client:
+        with Session(engine) as session:
+            pwd = get_password_hash("password")
+            session.add_all([Barber(name=f"B{i}", username=f"barber{i}", hashed_password=pwd) for i in range(BARBERS)])
+            session.commit()
+
+        print(f"{CONCURRENT_CLIENTS} clients x {LOGINS_PER_CLIENT} logins, {backend.auth.PASSWORD_HASH_ROUNDS} rounds")
+        for workers in (1, 2, 4, 8):
+            backend.auth.login_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="login")
+            backend.auth.login_slots = threading.BoundedSemaphore(workers + LOGIN_QUEUE_SIZE)
+            throughput, ok, rejected = burst(client)
+            p50 = ok[len(ok) // 2] if ok else 0
+            p95 = ok[int(len(ok) * 0.95)] if ok else 0
+            print(f"workers={workers}: {throughput:7.1f} req/s  p50 {p50:7.1f} ms  p95 {p95:7.1f} ms  429s {rejected}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,93 @@
+# Benchmark: serialization cost and payload size of /barbers and /appointments.
+#   python bench_serialization.py
+# Compares the old handlers (full Barber table model through response_model,
+# appointment dicts through jsonable_encoder + json.dumps) with the lean read
+# models / FastJSONResponse / cached barber list, end to end over ASGI, plus
+# the raw encoders on one 1000-row page.
+import asyncio
+import json
+import time
+from typing import List
+
+from bench_common import AsgiClient, summarize_latencies, use_temp_database
+
+use_temp_database()
+
+from fastapi import Depends, FastAPI, Response
+from fastapi.encoders import jsonable_encoder
+from sqlmodel import Session, select
+
+from backend.database import engine, get_session
+from backend.listing import AppointmentFilter, DEFAULT_FIELDS, fetch_page
+from backend.main import app
+from backend.models import Barber
+from backend.responses import dumps
+from backend.seed_data import bulk_seed
+
+REQUESTS = 300
+PAGE = 1000
+
+# The handlers as they were before the lean response models
+old_app = FastAPI()
+
+
+@old_app.get("/barbers", response_model=List[Barber])
+def old_barbers(session: Session = Depends(get_session)):
+    return session.exec(select(Barber)).all()
+
+
+@old_app.get("/appointments")
+def old_appointments(response: Response, limit: int = PAGE, session: Session = Depends(get_session)):
+    rows, _ = fetch_page(session, AppointmentFilter(), DEFAULT_FIELDS, None, limit)
+    return rows
+
+
+async def measure(client, path, params=None):
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        t = time.perf_counter()
+        status, _, body = await client.get(path, params=params)
+        latencies.append((time.perf_counter() - t) * 1000)
+        assert status == 200
+    result = summarize_latencies(latencies, time.perf_counter() - start)
+    result["bytes"] = len(body)
+    return result
+
+
+def time_encoder(encode, rows, rounds=200):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        body = encode(rows)
+    return (time.perf_counter() - start) / rounds * 1000, len(body)
+
+
+async def run_benchmark():
+    engine.echo = False
+    async with AsgiClient(app) as new_client:
+        bulk_seed(barbers=50, months=1)
+        old_client = AsgiClient(old_app)
+
+        print(f"{'endpoint':<28} {'p50 ms':>8} {'p95 ms':>8} {'req/s':>8} {'bytes':>9}")
+        for label, client, path, params in (
+            ("/barbers (before)", old_client, "/barbers", None),
+            ("/barbers (lean, cached)", new_client, "/barbers", None),
+            ("/appointments (before)", old_client, "/appointments", {"limit": PAGE}),
+            ("/appointments (fast JSON)", new_client, "/appointments", {"limit": PAGE}),
+        ):
+            r = await measure(client, path, params)
+            print(f"{label:<28} {r['p50_ms']:8.2f} {r['p95_ms']:8.2f} {r['throughput_rps']:8.1f} {r['bytes']:9d}")
+
+    with Session(engine) as session:
+        rows, _ = fetch_page(session, AppointmentFilter(), DEFAULT_FIELDS, None, PAGE)
+    print(f"\nEncoding one {PAGE}-row page:")
+    for label, encode in (
+        ("jsonable_encoder + json.dumps", lambda r: json.dumps(jsonable_encoder(r)).encode()),
+        ("FastJSONResponse (dumps)", dumps),
+    ):
+        ms, size = time_encoder(encode, rows)
+        print(f"  {label:<30} {ms:7.3f} ms  {size} bytes")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
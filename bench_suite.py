@@ -0,0 +1,180 @@
+# Benchmark suite for the main endpoints, driven in-process over ASGI (no
+# network) against seeded databases of increasing size.
+#
+#   python bench_suite.py                          # all sizes -> bench_results.json
+#   python bench_suite.py --sizes small --output before.json
+#   python bench_suite.py --compare before.json    # exit 1 on regressions
+#
+# Every endpoint reports p50/p95/p99 latency, sequential throughput and the
+# number of SQL statements per request. Each dataset size runs in its own
+# process with a fresh database.
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from bench_common import AsgiClient, summarize_latencies
+
+DATASETS = {
+    "small": {"barbers": 5, "months": 1},
+    "medium": {"barbers": 20, "months": 6},
+    "large": {"barbers": 50, "months": 12},
+}
+REQUESTS = 300
+LOGIN_REQUESTS = 20  # password hashing is deliberately slow
+P95_REGRESSION = 1.25  # fail --compare when p95 grows by more than 25%
+
+
+async def measure(client, counter, requests, send):
+    latencies, queries = [], 0
+    start = time.perf_counter()
+    for i in range(requests):
+        counter["n"] = 0
+        t = time.perf_counter()
+        status = await send(i)
+        latencies.append((time.perf_counter() - t) * 1000)
+        if status >= 500:
+            raise RuntimeError(f"request {i} failed with {status}")
+        queries += counter["n"]
+    result = summarize_latencies(latencies, time.perf_counter() - start)
+    result["queries_per_request"] = round(queries / requests, 2)
+    return result
+
+
+async def run_dataset(name):
+    from sqlalchemy import event
+    from sqlmodel import Session, select
+
+    from backend.auth import create_access_token
+    from backend.database import engine
+    from backend.main import app
+    from backend.models import Barber
+    from backend.seed_data import bulk_seed
+
+    engine.echo = False
+    async with AsgiClient(app) as client:
+        bulk_seed(**DATASETS[name])
+        with Session(engine) as session:
+            barbers = session.exec(select(Barber.id, Barber.username)).all()
+        ids = [b_id for b_id, _ in barbers]
+        tokens = [{"Authorization": f"Bearer {create_access_token({'sub': username})}"} for _, username in barbers]
+        today = date.today()
+
+        counter = {"n": 0}
+
+        def count(*args):
+            counter["n"] += 1
+
+        event.listen(engine, "before_cursor_execute", count)
+
+        async def slots(i):
+            day = today + timedelta(days=i % 14)
+            status, _, _ = await client.get("/slots", params={"barber_id": ids[i % len(ids)], "date": day.isoformat()})
+            return status
+
+        async def book(i):
+            # Far-future slots so every booking succeeds
+            day = date(2030, 1, 1) + timedelta(days=i // 16)
+            params = {"barber_id": ids[i % len(ids)], "date": day.isoformat(),
+                      "time": f"{9 + (i % 16) // 2:02d}:{(i % 2) * 30:02d}", "name": "Bench"}
+            status, _, _ = await client.post("/book", params=params)
+            return status
+
+        async def appointments(i):
+            day = today - timedelta(days=i % 30)
+            status, _, _ = await client.get("/appointments", params={"start_date": day.isoformat(), "limit": 100})
+            return status
+
+        async def admin_stats(i):
+            params = {"by_barber": "true"} if i % 2 else {}
+            status, _, _ = await client.get("/admin/stats", params=params)
+            return status
+
+        async def login(i):
+            status, _, _ = await client.post("/login", data={"username": barbers[i % len(barbers)][1], "password": "password"})
+            return status
+
+        async def dashboard(i):
+            status, _, _ = await client.get("/barber/dashboard-stats", headers=tokens[i % len(tokens)])
+            return status
+
+        results = {}
+        for path, send, requests in (
+            ("/slots", slots, REQUESTS),
+            ("/book", book, REQUESTS),
+            ("/appointments", appointments, REQUESTS),
+            ("/admin/stats", admin_stats, REQUESTS),
+            ("/login", login, LOGIN_REQUESTS),
+            ("/barber/dashboard-stats", dashboard, REQUESTS),
+        ):
+            results[path] = await measure(client, counter, requests, send)
+        event.remove(engine, "before_cursor_execute", count)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current):
+    # Returns a list of human-readable regressions
+    regressions = []
+    for size, endpoints in current["results"].items():
+        for path, now in endpoints.items():
+            before = baseline.get("results", {}).get(size, {}).get(path)
+            if not before:
+                continue
+            if before["p95_ms"] and now["p95_ms"] > before["p95_ms"] * P95_REGRESSION:
+                regressions.append(f"{size} {path}: p95 {before['p95_ms']} -> {now['p95_ms']} ms")
+            if now["queries_per_request"] > before["queries_per_request"]:
+                regressions.append(f"{size} {path}: queries/request {before['queries_per_request']} -> {now['queries_per_request']}")
+    return regressions
+
+
+def run_suite(sizes, output, baseline_path=None):
+    report = {"commit": git_commit(), "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": {}}
+    for size in sizes:
+        env = dict(os.environ, DB_PROFILE="production",
+                   DATABASE_URL="sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db"))
+        out = subprocess.run([sys.executable, __file__, "--child", size], env=env,
+                             stdout=subprocess.PIPE, text=True, check=True)
+        results = json.loads(out.stdout.strip().splitlines()[-1])
+        report["results"][size] = results
+
+        print(f"{size} ({DATASETS[size]['barbers']} barbers, {DATASETS[size]['months']} months)")
+        for path, r in results.items():
+            print(f"  {path:<26} p50 {r['p50_ms']:7.2f}  p95 {r['p95_ms']:7.2f}  p99 {r['p99_ms']:7.2f} ms"
+                  f"  {r['throughput_rps']:8.1f} req/s  {r['queries_per_request']:5.2f} queries/req")
+
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved {output}")
+
+    if baseline_path:
+        with open(baseline_path) as f:
+            regressions = compare(json.load(f), report)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions.")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        print(json.dumps(asyncio.run(run_dataset(sys.argv[2]))))
+    else:
+        parser = argparse.ArgumentParser(description="In-process endpoint benchmarks")
+        parser.add_argument("--sizes", nargs="+", default=list(DATASETS), choices=list(DATASETS))
+        parser.add_argument("--output", default="bench_results.json")
+        parser.add_argument("--compare", metavar="BASELINE", help="results JSON from an earlier run")
+        args = parser.parse_args()
+        run_suite(args.sizes, args.output, args.compare)
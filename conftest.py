@@ -0,0 +1,58 @@
+import os
+import tempfile
+
+# Point the app at a throwaway database before backend.database is imported
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db"))
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel
+
+from backend.auth import token_cache
+from backend.availability import availability_index
+from backend.coherence import change_feed
+from backend.dashboard import dashboard_counters
+from backend.database import engine
+from backend.holds import slot_holds
+from backend.main import app, barber_list
+from backend.metrics import request_metrics
+from backend.models import Barber, Shift
+from backend.schedule import shift_schedule
+from backend.versions import resource_versions
+
+DATE = "2026-02-02"  # a Monday
+
+
+@pytest.fixture
+def session():
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    availability_index.clear()
+    shift_schedule.clear()
+    slot_holds.clear()
+    token_cache.clear()
+    resource_versions.clear()
+    dashboard_counters.clear()
+    request_metrics.clear()
+    barber_list.clear()
+    change_feed.clear()
+    with Session(engine) as session:
+        yield session
+
+
+@pytest.fixture
+def client(session):
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def barber(session):
+    # Username "test", working Mondays 9-12
+    barber = Barber(name="Test", username="test", hashed_password="x")
+    session.add(barber)
+    session.commit()
+    session.add(Shift(barber_id=barber.id, weekday=0, start_hour=9, end_hour=12))
+    session.commit()
+    session.refresh(barber)
+    return barber
@@ -0,0 +1,129 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+from sqlmodel import func, select, text
+
+from backend.archive import archive_appointments
+from backend.database import create_db_and_tables, engine
+from backend.models import Appointment, ArchivedAppointment, Barber, DailyStats, Shift
+from backend.stats import rebuild_daily_stats
+
+CUTOFF = datetime(2026, 2, 3)
+
+
+def seed(session):
+    # 2 barbers x 10 bookings, one per day from Feb 1; Feb 1-2 go cold
+    barbers = [Barber(name=f"B{i}", username=f"b{i}", hashed_password="x") for i in range(2)]
+    session.add_all(barbers)
+    session.commit()
+    start = datetime(2026, 2, 1, 9)
+    session.add_all([
+        Appointment(barber_id=barber.id, customer_name=f"C{i}", time_slot=start + timedelta(hours=i * 12))
+        for barber in barbers for i in range(10)
+    ])
+    session.commit()
+    rebuild_daily_stats(session)
+
+
+def all_pages(client, **params):
+    seen, cursor = [], None
+    while True:
+        r = client.get("/appointments", params={**params, "limit": 3, **({"cursor": cursor} if cursor else {})})
+        seen.extend(r.json())
+        cursor = r.headers.get("x-next-cursor")
+        if not cursor:
+            return seen
+
+
+def test_archive_moves_old_bookings_in_batches(client, session):
+    seed(session)
+    before = all_pages(client)
+    stats = client.get("/admin/stats").json()
+
+    assert archive_appointments(CUTOFF, batch_size=3) == 8
+    assert session.exec(select(func.count()).select_from(ArchivedAppointment)).one() == 8
+    assert session.exec(select(func.min(Appointment.time_slot))).one() >= CUTOFF
+
+    # Listings merge both stores; totals come from the untouched rollup
+    assert all_pages(client) == before
+    assert all_pages(client, barber_id=1, end_date="2026-02-02") == [r for r in before if r["barber_id"] == 1][:4]
+    assert client.get("/admin/stats").json() == stats
+    rollup = select(DailyStats.barber_id, DailyStats.day, DailyStats.bookings, DailyStats.revenue).order_by(DailyStats.barber_id, DailyStats.day)
+    expected = session.exec(rollup).all()
+    rebuild_daily_stats(session)
+    assert session.exec(rollup).all() == expected
+
+
+def test_recent_ranges_skip_the_archive(client, session):
+    seed(session)
+    archive_appointments(CUTOFF)
+    queries = []
+    listener = lambda *args: queries.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        rows = client.get("/appointments", params={"start_date": "2026-02-04"}).json()
+        cold = client.get("/appointments", params={"start_date": "2026-02-02"}).json()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert len(rows) == 8 and len(cold) == 16
+    # Each request checks the archive's newest booking; only the second one
+    # reaches past it and pages through the archive
+    archive_pages = [q for q in queries if "FROM archivedappointment" in q and "max(" not in q]
+    assert len(archive_pages) == 1
+
+
+def test_archived_ids_are_not_reused(client, session):
+    seed(session)
+    archive_appointments(datetime(2027, 1, 1))
+    client.post("/book", params={"barber_id": 1, "date": "2026-03-02", "time": "10:00", "name": "New"})
+    assert session.exec(select(Appointment.id)).one() == 21
+    assert archive_appointments(datetime(2027, 1, 1)) == 1
+
+
+def test_migration_moves_appointment_ids_past_the_archive(session):
+    # A file from before AUTOINCREMENT, where a booking already took archived id 1
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE appointment"))
+        conn.execute(text(
+            "CREATE TABLE appointment (id INTEGER NOT NULL PRIMARY KEY, barber_id INTEGER NOT NULL, "
+            "customer_name VARCHAR NOT NULL, time_slot DATETIME NOT NULL, service_type VARCHAR NOT NULL)"
+        ))
+        conn.execute(text("INSERT INTO appointment VALUES (1, 1, 'Hot', '2026-03-02 10:00:00.000000', 'Haircut')"))
+        conn.execute(text("INSERT INTO archivedappointment VALUES (1, 1, 'Cold', '2026-01-05 10:00:00.000000', 'Haircut')"))
+        conn.execute(text("INSERT INTO archivedappointment VALUES (5, 1, 'Cold', '2026-01-06 10:00:00.000000', 'Haircut')"))
+    create_db_and_tables()
+
+    assert session.exec(select(Appointment.id, Appointment.customer_name)).all() == [(6, "Hot")]
+    session.add(Appointment(barber_id=1, customer_name="Next", time_slot=datetime(2026, 3, 3, 10)))
+    session.commit()
+    assert session.exec(select(func.max(Appointment.id))).one() == 7
+    with engine.connect() as conn:
+        indexes = conn.execute(text("SELECT name FROM sqlite_master WHERE tbl_name = 'appointment' AND sql IS NOT NULL")).scalars().all()
+    assert "ix_appointment_barber_slot" in indexes
+
+
+def test_archived_bookings_still_block_their_slots(client, session):
+    seed(session)
+    session.add(Shift(barber_id=1, weekday=0, start_hour=9, end_hour=10))
+    session.commit()
+    archive_appointments(CUTOFF)
+    params = {"barber_id": 1, "date": "2026-02-02"}
+    assert "09:00" not in client.get("/slots", params=params).json()
+    bulk = client.get("/slots/bulk", params={"start_date": "2026-02-02", "end_date": "2026-02-02", "barber_ids": 1}).json()
+    assert "09:00" not in bulk[0]["slots"]
+
+    stats = client.get("/admin/stats").json()
+    assert client.post("/book", params={**params, "time": "09:00", "name": "Again"}).status_code == 400
+    assert client.get("/admin/stats").json() == stats
+
+
+def test_archived_bookings_can_be_deleted(client, session):
+    seed(session)
+    archive_appointments(CUTOFF)
+    archived_id = session.exec(select(func.min(ArchivedAppointment.id))).one()
+    stats = client.get("/admin/stats").json()
+
+    assert client.delete(f"/appointments/{archived_id}").status_code == 200
+    assert session.exec(select(func.count()).select_from(ArchivedAppointment)).one() == 7
+    assert client.get("/admin/stats").json()["total_bookings"] == stats["total_bookings"] - 1
+    assert archived_id not in [row["id"] for row in all_pages(client)]
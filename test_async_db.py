@@ -0,0 +1,91 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from datetime import timedelta
+
+from fastapi import HTTPException, Request, Response
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend import async_routes
+from backend.auth import create_access_token
+from backend.database import get_async_engine
+from backend.models import Appointment, DailyStats
+from conftest import DATE
+
+# The app as DB_MODE=async builds it; DB_MODE is read at import, so in its own process
+ASYNC_APP = """
+import json, sys
+from fastapi.testclient import TestClient
+from backend.main import app
+with TestClient(app) as client:
+    responses = [client.request(method, path, **kwargs) for method, path, kwargs in json.loads(sys.argv[1])]
+print(json.dumps([(r.status_code, r.json()) for r in responses]))
+"""
+
+
+def run_async_app(*requests):
+    result = subprocess.run([sys.executable, "-c", ASYNC_APP, json.dumps(requests)], check=True, capture_output=True,
+                            text=True, env={**os.environ, "DB_MODE": "async"},
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    return json.loads(result.stdout.splitlines()[-1])  # after the dev profile's SQL echo
+
+
+def request():
+    return Request({"type": "http", "headers": [], "method": "GET", "path": "/"})
+
+
+def run(handler, *args, **kwargs):
+    async def call():
+        async with AsyncSession(get_async_engine(), expire_on_commit=False) as session:
+            return await handler(*args, session=session, **kwargs)
+    return asyncio.run(call())
+
+
+def test_async_handlers_match_sync_behaviour(session, barber):
+
+    assert run(async_routes.get_slots, request(), Response(), barber.id, DATE) == ["09:00", "09:30", "10:00", "10:30", "11:00", "11:30"]
+    assert run(async_routes.book_appointment, barber.id, DATE, "09:30", "A") == {"message": "Booking successful"}
+    try:
+        run(async_routes.book_appointment, barber.id, DATE, "09:30", "B")
+        assert False, "double booking accepted"
+    except HTTPException as e:
+        assert e.detail == "Slot already booked"
+
+    assert run(async_routes.get_slots, request(), Response(), barber.id, DATE) == ["09:00", "10:00", "10:30", "11:00", "11:30"]
+    page = run(async_routes.get_all_appointments, request(), Response(), None, None, None, None, None, 100, None)
+    rows = json.loads(page.body)
+    assert [(r["customer_name"], r["barber_name"]) for r in rows] == [("A", "Test")]
+    assert session.exec(select(DailyStats.bookings)).one() == 1
+    assert len(session.exec(select(Appointment)).all()) == 1
+
+
+def test_async_routes_cover_hot_paths():
+    paths = {(route.path, tuple(route.methods)) for route in async_routes.router.routes}
+    assert paths == {
+        ("/slots", ("GET",)),
+        ("/book", ("POST",)),
+        ("/appointments", ("GET",)),
+        ("/barber/dashboard-stats", ("GET",)),
+    }
+
+
+def test_async_mode_over_http(session, barber):
+    params = {"barber_id": barber.id, "date": DATE}
+    token = create_access_token({"sub": "test"}, timedelta(minutes=5))
+    slots, booked, rebooked, appointments, stats, unauthorized = run_async_app(
+        ("GET", "/slots", {"params": params}),
+        ("POST", "/book", {"params": {**params, "time": "09:30", "name": "A"}}),
+        ("POST", "/book", {"params": {**params, "time": "09:30", "name": "B"}}),
+        ("GET", "/appointments", {}),
+        ("GET", "/barber/dashboard-stats", {"headers": {"Authorization": f"Bearer {token}"}}),
+        ("GET", "/barber/dashboard-stats", {"headers": {"Authorization": "Bearer nope"}}),
+    )
+    assert slots == [200, ["09:00", "09:30", "10:00", "10:30", "11:00", "11:30"]]
+    assert booked == [200, {"message": "Booking successful"}]
+    assert rebooked == [400, {"detail": "Slot already booked"}]
+    assert appointments[0] == 200 and [r["customer_name"] for r in appointments[1]] == ["A"]
+    assert stats[0] == 200 and stats[1]["name"] == "Test" and stats[1]["is_checked_in"] is False
+    assert unauthorized[0] == 401
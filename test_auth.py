@@ -0,0 +1,62 @@
+import threading
+import time
+from datetime import timedelta
+
+from passlib.context import CryptContext
+
+import backend.auth
+from backend.auth import PASSWORD_HASH_ROUNDS, TokenCache, create_access_token, pwd_context, token_cache
+from backend.models import Barber
+
+
+def auth_header(username):
+    token = create_access_token({"sub": username}, expires_delta=timedelta(minutes=5))
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_cached_token_skips_lookup_and_toggle_invalidates(client, barber):
+    headers = auth_header("test")
+
+    assert client.get("/barber/dashboard-stats", headers=headers).json()["is_checked_in"] is False
+    assert client.get("/barber/dashboard-stats", headers=headers).json()["is_checked_in"] is False
+    assert token_cache.stats()["hits"] == 1 and token_cache.stats()["misses"] == 1
+
+    assert client.post("/barber/toggle-status", headers=headers).json() == {"status": "checked_in"}
+    assert client.get("/barber/dashboard-stats", headers=headers).json()["is_checked_in"] is True
+    assert client.post("/barber/toggle-status", headers=headers).json() == {"status": "checked_out"}
+
+
+def test_lru_eviction_and_ttl():
+    cache = TokenCache(maxsize=2, ttl_seconds=60)
+    barbers = [Barber(id=i, name="B", username=f"b{i}", hashed_password="x") for i in range(3)]
+    for i, barber in enumerate(barbers):
+        cache.put(f"t{i}", barber, time.time() + 300)
+    assert cache.get("t0") is None
+    assert cache.get("t2").username == "b2"
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 1, "size": 2}
+
+    cache.put("expired", barbers[0], time.time() - 1)
+    assert cache.get("expired") is None
+
+
+def test_login_rehashes_when_cost_changes(client, session):
+    old_context = CryptContext(schemes=["pbkdf2_sha256"], pbkdf2_sha256__default_rounds=1000)
+    barber = Barber(name="Test", username="test", hashed_password=old_context.hash("secret"))
+    session.add(barber)
+    session.commit()
+
+    assert client.post("/login", data={"username": "test", "password": "wrong"}).status_code == 400
+    r = client.post("/login", data={"username": "test", "password": "secret"})
+    assert r.status_code == 200 and r.json()["role"] == "barber"
+
+    session.refresh(barber)
+    assert f"${PASSWORD_HASH_ROUNDS}$" in barber.hashed_password
+    assert pwd_context.verify("secret", barber.hashed_password)
+
+
+def test_login_returns_429_when_pool_saturated(client, session, monkeypatch):
+    monkeypatch.setattr(backend.auth, "login_slots", threading.BoundedSemaphore(1))
+    backend.auth.login_slots.acquire()
+    r = client.post("/login", data={"username": "test", "password": "secret"})
+    assert r.status_code == 429
+    assert r.headers["retry-after"] == "1"
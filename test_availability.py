@@ -0,0 +1,99 @@
+from datetime import date, datetime
+
+from backend.availability import availability_index, DayIntervals, minute_labels
+from backend.schedule import shift_windows
+from backend.models import Appointment
+from conftest import DATE
+
+
+def test_day_intervals():
+    day = DayIntervals(shift_windows(12, 15))
+    assert minute_labels(day.free_starts(30)) == ["12:00", "12:30", "13:00", "13:30", "14:00", "14:30"]
+    assert shift_windows(17, 9) == ()
+
+    # 12:00-12:15 and 13:00-14:30 booked
+    day = day.with_booking((720, 735)).with_booking((780, 870))
+    assert minute_labels(day.free_starts(15)) == ["12:15", "12:30", "14:30"]
+    assert minute_labels(day.free_starts(45)) == ["12:15"]
+    assert day.free_starts(90) == []
+    assert day.overlaps(760, 790) and not day.overlaps(735, 780)
+    assert day.fits(870, 900) and not day.fits(870, 910)
+    assert minute_labels(day.without_booking((780, 870)).free_starts(90, busy=[(840, 855)])) == ["12:15", "12:30"]
+
+    # Overlapping (imported) bookings are still handled by the bisect lookups
+    day = DayIntervals(shift_windows(9, 12), [(540, 660), (570, 600)])
+    assert day.overlaps(620, 630) and not day.overlaps(660, 690)
+    assert minute_labels(day.free_starts(30)) == ["11:00", "11:30"]
+
+
+def test_slots_follow_bookings_and_cancellations(client, session, barber):
+    barber_id = barber.id
+    r = client.get("/slots", params={"barber_id": barber_id, "date": DATE})
+    assert r.json() == ["09:00", "09:30", "10:00", "10:30", "11:00", "11:30"]
+
+    client.post("/book", params={"barber_id": barber_id, "date": DATE, "time": "10:00", "name": "A"})
+    slots = client.get("/slots", params={"barber_id": barber_id, "date": DATE}).json()
+    assert "10:00" not in slots
+
+    appt_id = session.query(Appointment).one().id
+    client.delete(f"/appointments/{appt_id}")
+    slots = client.get("/slots", params={"barber_id": barber_id, "date": DATE}).json()
+    assert "10:00" in slots
+
+
+def test_shift_update_applies_to_cached_days(client, session, barber):
+    barber_id = barber.id
+    client.post("/book", params={"barber_id": barber_id, "date": DATE, "time": "13:00", "name": "A"})
+    assert client.get("/slots", params={"barber_id": barber_id, "date": DATE}).json()[0] == "09:00"
+
+    client.post("/shifts", json={"barber_id": barber_id, "weekday": 0, "start_hour": 12, "end_hour": 14})
+    slots = client.get("/slots", params={"barber_id": barber_id, "date": DATE}).json()
+    assert slots == ["12:00", "12:30", "13:30"]
+
+
+def test_index_matches_database_after_reload(client, session, barber):
+    barber_id = barber.id
+    session.add(Appointment(barber_id=barber_id, customer_name="B", time_slot=datetime(2026, 2, 2, 9, 30)))
+    session.commit()
+    availability_index.clear()
+    slots = client.get("/slots", params={"barber_id": barber_id, "date": DATE}).json()
+    assert slots == ["09:00", "10:00", "10:30", "11:00", "11:30"]
+
+
+def test_index_drops_least_recently_used_days(client, session, monkeypatch, barber):
+    barber_id = barber.id
+    monkeypatch.setattr(availability_index, "maxsize", 2)
+    for day in ("2026-02-02", "2026-02-09", "2026-02-02", "2026-02-16"):
+        client.get("/slots", params={"barber_id": barber_id, "date": day})
+    assert availability_index.cached_day(barber_id, date(2026, 2, 2)) is not None
+    assert availability_index.cached_day(barber_id, date(2026, 2, 9)) is None
+    assert availability_index.cached_day(barber_id, date(2026, 2, 16)) is not None
+
+
+def test_bulk_slots_match_single_day_lookups(client, session, barber):
+    barber_id = barber.id
+    client.post("/book", params={"barber_id": barber_id, "date": DATE, "time": "09:00", "name": "A"})
+    availability_index.clear()
+
+    rows = client.get("/slots/bulk", params={"start_date": "2026-02-01", "end_date": "2026-02-09"}).json()
+    assert [(r["barber_id"], r["date"]) for r in rows][:2] == [(barber_id, "2026-02-01"), (barber_id, "2026-02-02")]
+    for row in rows:
+        single = client.get("/slots", params={"barber_id": row["barber_id"], "date": row["date"]}).json()
+        assert row["slots"] == single
+    assert rows[1]["slots"][0] == "09:30"
+    assert rows[8]["slots"][0] == "09:00"
+
+
+def test_bulk_slots_stream_ndjson(client, session, barber):
+    barber_id = barber.id
+    r = client.get("/slots/bulk", params={
+        "start_date": "2026-02-01", "end_date": "2026-03-31", "barber_ids": [barber_id], "stream": True
+    })
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    lines = r.text.splitlines()
+    assert len(lines) == 59
+    # Streamed days aren't kept in the index
+    assert availability_index.cached_day(barber_id, date(2026, 2, 2)) is None
+
+    r = client.get("/slots/bulk", params={"start_date": "2026-01-01", "end_date": "2026-12-31"})
+    assert r.status_code == 400
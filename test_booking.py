@@ -0,0 +1,100 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from fastapi import HTTPException
+from sqlmodel import Session, select
+
+from backend.database import engine
+from backend.main import book_appointment
+from backend.models import Appointment
+from conftest import DATE
+
+
+def test_parallel_bookings_exactly_one_wins(session, barber):
+    barber_id = barber.id
+
+    def attempt(i):
+        with Session(engine) as s:
+            try:
+                book_appointment(barber_id, DATE, "10:00", f"Customer {i}", session=s)
+                return "ok"
+            except HTTPException as e:
+                return e.detail
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(attempt, range(300)))
+
+    assert results.count("ok") == 1
+    assert results.count("Slot already booked") == 299
+    assert len(session.exec(select(Appointment)).all()) == 1
+
+
+def test_hold_blocks_other_customers(client, session, barber):
+    barber_id = barber.id
+    params = {"barber_id": barber_id, "date": DATE, "time": "10:00"}
+
+    hold = client.post("/slots/hold", params=params).json()
+    assert "10:00" not in client.get("/slots", params={"barber_id": barber_id, "date": DATE}).json()
+    assert client.post("/slots/hold", params=params).json()["detail"] == "Slot is on hold"
+
+    r = client.post("/book", params={**params, "name": "Other"})
+    assert r.status_code == 400 and r.json()["detail"] == "Slot is on hold"
+
+    r = client.post("/book", params={**params, "name": "Holder", "hold_id": hold["hold_id"]})
+    assert r.status_code == 200
+    assert client.delete(f"/slots/hold/{hold['hold_id']}").status_code == 404
+
+
+def test_released_hold_frees_slot(client, session, barber):
+    barber_id = barber.id
+    params = {"barber_id": barber_id, "date": DATE, "time": "10:00"}
+    hold = client.post("/slots/hold", params=params).json()
+    client.delete(f"/slots/hold/{hold['hold_id']}")
+    assert "10:00" in client.get("/slots", params={"barber_id": barber_id, "date": DATE}).json()
+    assert client.post("/book", params={**params, "name": "A"}).status_code == 200
+    assert client.post("/book", params={**params, "name": "B"}).json()["detail"] == "Slot already booked"
+
+
+def test_services_book_intervals_not_slots(client, session, barber):
+    barber_id = barber.id
+    day = {"barber_id": barber_id, "date": DATE}
+
+    assert client.post("/book", params={**day, "time": "10:00", "name": "A", "service": "Cut & Color"}).status_code == 200
+    r = client.post("/book", params={**day, "time": "11:00", "name": "B"})
+    assert r.status_code == 400 and r.json()["detail"] == "Slot already booked"
+    assert client.post("/book", params={**day, "time": "09:00", "name": "C", "service": "Beard Trim"}).status_code == 200
+    assert client.post("/book", params={**day, "time": "09:00", "name": "D", "service": "Massage"}).status_code == 400
+
+    assert client.get("/slots", params=day).json() == ["09:15", "09:30", "11:30"]
+    assert client.get("/slots", params={**day, "service": "Beard Trim"}).json() == ["09:15", "09:30", "11:30"]
+    assert client.get("/slots", params={**day, "service": "Haircut & Beard"}).json() == ["09:15"]
+
+    # A 45 minute hold blocks every start that would overlap it
+    hold = client.post("/slots/hold", params={**day, "time": "09:15", "service": "Haircut & Beard"}).json()
+    assert client.get("/slots", params={**day, "service": "Beard Trim"}).json() == ["11:30"]
+    r = client.post("/book", params={**day, "time": "09:30", "name": "E", "service": "Beard Trim"})
+    assert r.json()["detail"] == "Slot is on hold"
+    r = client.post("/book", params={**day, "time": "09:15", "name": "F", "service": "Haircut & Beard", "hold_id": hold["hold_id"]})
+    assert r.status_code == 200
+
+    assert client.get("/admin/stats").json()["revenue"] == 70 + 15 + 35
+
+
+def test_parallel_overlapping_bookings_never_overlap(session, barber):
+    barber_id = barber.id
+    starts = [f"{9 + m // 60:02d}:{m % 60:02d}" for m in range(0, 150, 15)]
+
+    def attempt(i):
+        with Session(engine) as s:
+            try:
+                book_appointment(barber_id, DATE, starts[i % len(starts)], f"Customer {i}", service="Haircut & Beard", session=s)
+            except HTTPException:
+                pass
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(attempt, range(100)))
+
+    booked = sorted(session.exec(select(Appointment.time_slot)).all())
+    assert booked
+    for earlier, later in zip(booked, booked[1:]):
+        assert later - earlier >= timedelta(minutes=45)
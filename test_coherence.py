@@ -0,0 +1,114 @@
+import asyncio
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+from datetime import date, timedelta
+
+from sqlmodel import select
+
+from backend import coherence
+from backend.auth import create_access_token
+from backend.coherence import ChangeFeed, apply_change, change_feed, record_change
+from backend.events import event_broker
+from backend.models import ChangeLog
+from conftest import DATE
+
+# A second worker process on the same database file
+WORKER = """
+import json, sys
+from fastapi.testclient import TestClient
+from backend.main import app
+with TestClient(app) as client:
+    for method, path, kwargs in json.loads(sys.argv[1]):
+        assert client.request(method, path, **kwargs).status_code == 200
+"""
+
+
+def run_worker(*requests):
+    subprocess.run([sys.executable, "-c", WORKER, json.dumps(requests)], check=True, capture_output=True,
+                   cwd=os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_changes_from_another_worker_invalidate_caches(client, session, barber):
+    params = {"barber_id": barber.id, "date": DATE}
+
+    first = client.get("/slots", params=params)
+    assert first.json() == ["09:00", "09:30", "10:00", "10:30", "11:00", "11:30"]
+    assert client.get("/barbers").json()[0]["is_checked_in"] is False
+
+    run_worker(("POST", "/book", {"params": {**params, "time": "10:00", "name": "A"}}))
+    r = client.get("/slots", params=params, headers={"If-None-Match": first.headers["etag"]})
+    assert r.status_code == 200 and r.json() == ["09:00", "09:30", "10:30", "11:00", "11:30"]
+
+    run_worker(("POST", "/shifts", {"json": {"barber_id": barber.id, "weekday": 0, "start_hour": 10, "end_hour": 12}}))
+    assert client.get("/slots", params=params).json() == ["10:30", "11:00", "11:30"]
+
+    token = create_access_token({"sub": "test"}, timedelta(minutes=5))
+    run_worker(("POST", "/barber/toggle-status", {"headers": {"Authorization": f"Bearer {token}"}}))
+    assert client.get("/barbers").json()[0]["is_checked_in"] is True
+
+
+
+def test_holds_are_shared_between_workers(client, session, barber):
+    params = {"barber_id": barber.id, "date": DATE}
+    assert "10:00" in client.get("/slots", params=params).json()
+
+    run_worker(("POST", "/slots/hold", {"params": {**params, "time": "10:00"}}))
+    assert "10:00" not in client.get("/slots", params=params).json()
+    r = client.post("/book", params={**params, "time": "10:00", "name": "B"})
+    assert r.status_code == 400 and r.json()["detail"] == "Slot is on hold"
+
+
+def test_changes_from_another_worker_reach_event_streams():
+    async def receive():
+        subscription = event_broker.subscribe(1, date(2026, 2, 2))
+        try:
+            apply_change("slots", 1, date(2026, 2, 2))
+            apply_change("slots", 1, date(2026, 2, 3))  # another day: not sent
+            apply_change("shifts", 1, None)
+            return [await subscription.queue.get() for _ in range(2)]
+        finally:
+            event_broker.unsubscribe(subscription)
+
+    assert asyncio.run(receive()) == [
+        {"type": "slot-changed", "barber_id": 1, "date": "2026-02-02"},
+        {"type": "shift-changed", "barber_id": 1},
+    ]
+
+def test_change_log_is_pruned_while_running(session, monkeypatch):
+    monkeypatch.setattr(coherence, "CHANGELOG_KEEP", 3)
+    for day in range(1, 8):
+        record_change(session, "slots", 1, date(2026, 2, day))
+    session.commit()
+    change_feed.sync()
+    assert session.exec(select(ChangeLog.seq)).all() == [5, 6, 7]
+
+
+def test_locked_database_skips_the_sync_until_the_next_request(session):
+    feed = ChangeFeed(change_feed.path)
+    feed._conn = sqlite3.connect(feed.path, timeout=0.05, check_same_thread=False, isolation_level=None)
+    feed.clear()
+    record_change(session, "slots", 1, date(2026, 2, 2))
+    session.commit()
+
+    locker = sqlite3.connect(feed.path, isolation_level=None)
+    locker.execute("BEGIN EXCLUSIVE")
+    try:
+        feed.sync()
+        assert feed._seq == 0
+    finally:
+        locker.execute("ROLLBACK")
+    feed.sync()
+    assert feed._seq == 1
+
+
+def test_only_api_requests_sync(client, session, monkeypatch):
+    synced = []
+    monkeypatch.setattr(change_feed, "sync", lambda: synced.append(True))
+    client.get("/metrics")
+    client.get("/static/missing.js")
+    assert synced == []
+    client.get("/barbers")
+    assert synced == [True]
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+from sqlmodel import select
+
+from backend.auth import create_access_token
+from backend.database import engine
+from backend.models import Appointment, Barber
+
+
+def test_counters_follow_bookings_without_queries(client, session):
+    barber = Barber(name="Test", username="test", hashed_password="x")
+    session.add(barber)
+    session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'test'}, timedelta(minutes=5))}"}
+
+    now = datetime.now()
+    tomorrow = now + timedelta(days=1)
+    session.add(Appointment(barber_id=barber.id, customer_name="Tomorrow", time_slot=tomorrow))
+    session.commit()
+
+    stats = client.get("/barber/dashboard-stats", headers=headers).json()
+    assert stats["customers_served_today"] == 0  # tomorrow's booking isn't today's
+
+    late = now.replace(hour=23, minute=30, second=0, microsecond=0)
+    if late <= now:
+        late = now.replace(second=0, microsecond=0)
+    client.post("/book", params={"barber_id": barber.id, "date": late.strftime("%Y-%m-%d"),
+                                 "time": late.strftime("%H:%M"), "name": "A"})
+
+    queries = []
+    listener = lambda *args: queries.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        stats = client.get("/barber/dashboard-stats", headers=headers).json()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert queries == []
+    assert stats["customers_served_today"] == 1
+    assert stats["total_earned_today"] == 25
+
+    appt_id = session.exec(select(Appointment.id).where(Appointment.customer_name == "A")).one()
+    client.delete(f"/appointments/{appt_id}")
+    stats = client.get("/barber/dashboard-stats", headers=headers).json()
+    assert stats["customers_served_today"] == 0 and stats["queue_duration_minutes"] == 0
@@ -0,0 +1,41 @@
+import os
+import tempfile
+
+from sqlmodel import text
+
+from backend.database import engine, make_engine, migrate_indexes
+
+
+def pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_production_profile_tunes_sqlite():
+    url = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "prod.db")
+    engine = make_engine(url, "production")
+    assert engine.echo is False
+    assert engine.pool.size() == 10
+    assert pragma(engine, "journal_mode") == "wal"
+    assert pragma(engine, "synchronous") == 1  # NORMAL
+    assert pragma(engine, "busy_timeout") == 5000
+    assert pragma(engine, "cache_size") == -64000
+
+
+def test_dev_profile_keeps_defaults():
+    url = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "dev.db")
+    engine = make_engine(url, "dev")
+    assert engine.echo is True
+    assert pragma(engine, "journal_mode") == "delete"
+
+
+def test_double_bookings_skip_the_unique_index_with_a_warning(session, caplog):
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_appointment_barber_slot"))
+        for name in ("A", "B"):
+            conn.execute(text(f"INSERT INTO appointment (barber_id, customer_name, time_slot, service_type) "
+                              f"VALUES (1, '{name}', '2026-02-02 10:00:00.000000', 'Haircut')"))
+    migrate_indexes()
+    assert "1 double-booked slots found, skipping ix_appointment_barber_slot" in caplog.text
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'ix_appointment_barber_slot'")).first() is None
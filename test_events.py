@@ -0,0 +1,74 @@
+import asyncio
+from datetime import date
+
+from sqlmodel import select
+
+from backend.events import EventBroker, event_broker, sse_stream
+from backend.models import Appointment, Barber
+
+DAY = date(2026, 2, 2)  # a Monday
+
+
+async def next_event(subscription):
+    return await asyncio.wait_for(subscription.queue.get(), timeout=2)
+
+
+def test_book_cancel_and_shift_publish_events(client, session):
+    barber = Barber(name="Test", username="test", hashed_password="x")
+    session.add(barber)
+    session.commit()
+
+    async def scenario():
+        day_sub = event_broker.subscribe(barber.id, DAY)
+        other_day = event_broker.subscribe(barber.id, date(2026, 2, 3))
+        admin_sub = event_broker.subscribe()
+
+        params = {"barber_id": barber.id, "date": "2026-02-02", "time": "10:00", "name": "A"}
+        await asyncio.to_thread(client.post, "/book", params=params)
+        taken = await next_event(day_sub)
+        assert taken == {"type": "slot-taken", "barber_id": barber.id, "date": "2026-02-02", "time": "10:00", "minutes": 30}
+        assert (await next_event(admin_sub))["type"] == "slot-taken"
+
+        appt_id = session.exec(select(Appointment.id)).one()
+        await asyncio.to_thread(client.delete, f"/appointments/{appt_id}")
+        assert (await next_event(day_sub))["type"] == "slot-freed"
+
+        shift = {"barber_id": barber.id, "weekday": 0, "start_hour": 10, "end_hour": 12}
+        await asyncio.to_thread(client.post, "/shifts", json=shift)
+        assert (await next_event(day_sub))["type"] == "shift-changed"
+        assert other_day.queue.empty()
+
+        for sub in (day_sub, other_day, admin_sub):
+            event_broker.unsubscribe(sub)
+
+    asyncio.run(scenario())
+    assert event_broker.subscriber_count() == 0
+
+
+def test_slow_subscriber_is_dropped_without_blocking_publisher():
+    broker = EventBroker(queue_size=3)
+
+    async def scenario():
+        slow = broker.subscribe(1, DAY)
+        fast = broker.subscribe(1, DAY)
+        for i in range(5):
+            broker.publish_slot("slot-taken", 1, DAY, f"1{i}:00", 30)
+            if i < 2:
+                await asyncio.sleep(0)
+                await fast.queue.get()
+        await asyncio.sleep(0)
+
+        assert slow.dropped and not fast.dropped
+        frames = [frame async for frame in sse_stream(broker, slow)]
+        assert frames == []
+        assert broker.subscriber_count() == 1
+
+        frame = await sse_stream(broker, fast).__anext__()
+        assert frame.startswith("event: slot-taken\ndata: ")
+
+    asyncio.run(scenario())
+
+
+def test_events_endpoint_requires_a_topic(client):
+    assert client.get("/events").status_code == 400
+    assert client.get("/events", params={"barber_id": 1, "date": "bad"}).status_code == 400
@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+from backend.models import Appointment, Barber
+
+
+def seed(session, per_barber=25):
+    barbers = [Barber(name=f"B{i}", username=f"b{i}", hashed_password="x") for i in range(2)]
+    session.add_all(barbers)
+    session.commit()
+    start = datetime(2026, 2, 1, 9)
+    for barber in barbers:
+        session.add_all([
+            Appointment(barber_id=barber.id, customer_name=f"C{i}", time_slot=start + timedelta(hours=i * 5))
+            for i in range(per_barber)
+        ])
+    session.commit()
+    return [b.id for b in barbers]
+
+
+def test_keyset_pages_cover_everything_once(client, session):
+    seed(session)
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 7}
+        if cursor:
+            params["cursor"] = cursor
+        r = client.get("/appointments", params=params)
+        seen.extend(r.json())
+        cursor = r.headers.get("x-next-cursor")
+        if not cursor:
+            break
+
+    assert len(seen) == 50
+    assert len({row["id"] for row in seen}) == 50
+    keys = [(row["time_slot"], row["id"]) for row in seen]
+    assert keys == sorted(keys)
+    assert seen[0]["barber_name"] == "B0"
+
+
+def test_filters_and_field_selection(client, session):
+    b1, _ = seed(session)
+    r = client.get("/appointments", params={
+        "barber_id": b1, "start_date": "2026-02-02", "end_date": "2026-02-02", "fields": "customer_name,time_slot"
+    })
+    rows = r.json()
+    assert rows and all(set(row) == {"customer_name", "time_slot"} for row in rows)
+    assert all(row["time_slot"].startswith("2026-02-02") for row in rows)
+    assert "x-next-cursor" not in r.headers
+
+    assert client.get("/appointments", params={"fields": "hashed_password"}).status_code == 400
+    assert client.get("/appointments", params={"cursor": "nope"}).status_code == 400
+
+
+def test_streaming_exports(client, session, monkeypatch):
+    monkeypatch.setattr("backend.listing.EXPORT_BATCH_SIZE", 8)
+    seed(session)
+
+    lines = client.get("/appointments", params={"format": "ndjson"}).text.splitlines()
+    assert len(lines) == 50 and json.loads(lines[0])["customer_name"] == "C0"
+
+    r = client.get("/appointments", params={"format": "csv", "fields": "id,barber_name"})
+    assert r.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(io.StringIO(r.text)))
+    assert rows[0] == ["id", "barber_name"] and len(rows) == 51
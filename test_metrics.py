@@ -0,0 +1,73 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from backend import metrics
+from backend.database import engine
+from backend.metrics import MetricsMiddleware, RequestMetrics
+from backend.models import Barber, Shift
+
+
+def sample(text, line_prefix):
+    for line in text.splitlines():
+        if line.startswith(line_prefix):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+def test_metrics_counts_requests_and_statements_per_route(client, session):
+    barber = Barber(name="Test", username="test", hashed_password="x")
+    session.add(barber)
+    session.commit()
+
+    for _ in range(3):
+        client.get("/slots", params={"barber_id": barber.id, "date": "2026-02-02"})
+    client.get("/slots", params={"barber_id": barber.id, "date": "bad"})
+
+    text = client.get("/metrics").text
+    route = 'method="GET",route="/slots"'
+    assert sample(text, f'http_requests_total{{{route},status="200"}}') == 3
+    assert sample(text, f'http_requests_total{{{route},status="400"}}') == 1
+    assert sample(text, f'http_request_duration_seconds_count{{{route}}}') == 4
+    assert sample(text, f'http_request_duration_seconds_bucket{{{route},le="+Inf"}}') == 4
+    # Only the first request reads the schedule (shifts + overrides); the rest
+    # hit the index
+    assert sample(text, f'db_statements_total{{{route}}}') == 2
+    assert sample(text, f'db_n_plus_one_total{{{route}}}') == 0
+    assert "token_cache_hits_total" in text
+
+
+def test_repeated_select_is_flagged_and_slow_requests_logged(session, monkeypatch, caplog):
+    session.add_all([Barber(name=f"B{i}", username=f"b{i}", hashed_password="x") for i in range(6)])
+    session.commit()
+
+    recorded = RequestMetrics()
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, metrics=recorded)
+
+    @app.get("/shifts/{barber_id}")
+    def one_query(barber_id: int):
+        with Session(engine) as s:
+            return s.exec(select(Shift).where(Shift.barber_id == barber_id)).all()
+
+    @app.get("/n-plus-one")
+    def n_plus_one():
+        with Session(engine) as s:
+            return [len(s.exec(select(Shift).where(Shift.barber_id == b.id)).all()) for b in s.exec(select(Barber)).all()]
+
+    monkeypatch.setattr(metrics, "SLOW_REQUEST_MS", 0.001)
+    with TestClient(app) as client, caplog.at_level(logging.WARNING, logger="backend.metrics"):
+        client.get("/shifts/1")
+        client.get("/shifts/2")  # same route template, no N+1
+        client.get("/n-plus-one")
+
+    text = recorded.render()
+    assert 'http_requests_total{method="GET",route="/shifts/{barber_id}",status="200"} 2' in text
+    assert 'db_n_plus_one_total{method="GET",route="/shifts/{barber_id}"} 0' in text
+    assert 'db_n_plus_one_total{method="GET",route="/n-plus-one"} 1' in text
+    assert 'db_statements_total{method="GET",route="/n-plus-one"} 7' in text
+    assert any("Possible N+1" in r.message and "FROM shift" in r.message for r in caplog.records)
+    slow = [r.getMessage() for r in caplog.records if r.getMessage().startswith("Slow request GET /n-plus-one")]
+    assert slow and slow[0].count("FROM shift") == 6
@@ -0,0 +1,67 @@
+from sqlalchemy import event
+
+from backend.database import engine
+from backend.models import Barber, Shift
+from conftest import DATE
+
+
+def add_barbers(session):
+    # a: Mon 9-12, b: Mon 10-12 (checked in), c: Tue 9-17 only, d: inactive
+    barbers = [
+        Barber(name="A", username="a", hashed_password="x"),
+        Barber(name="B", username="b", hashed_password="x", is_checked_in=True),
+        Barber(name="C", username="c", hashed_password="x"),
+        Barber(name="D", username="d", hashed_password="x", is_active=False),
+    ]
+    session.add_all(barbers)
+    session.commit()
+    a, b, c, d = (barber.id for barber in barbers)
+    session.add_all([
+        Shift(barber_id=a, weekday=0, start_hour=9, end_hour=12),
+        Shift(barber_id=b, weekday=0, start_hour=10, end_hour=12),
+        Shift(barber_id=c, weekday=1, start_hour=9, end_hour=17),
+        Shift(barber_id=d, weekday=0, start_hour=0, end_hour=24),
+    ])
+    session.commit()
+    return a, b, c
+
+
+def found(r):
+    assert r.status_code == 200
+    return [(row["barber_name"], row["date"], row["time"]) for row in r.json()]
+
+
+def test_next_available_merges_barbers_in_time_order(client, session):
+    a, _, _ = add_barbers(session)
+    client.post("/book", params={"barber_id": a, "date": DATE, "time": "10:00", "name": "X", "service": "Haircut & Beard"})
+
+    # A is free right away (09:10), then has a gap before the 10:00 booking
+    r = client.get("/slots/next", params={"date": DATE, "time": "09:10", "limit": 6})
+    assert found(r) == [
+        ("A", DATE, "09:10"), ("A", DATE, "09:30"), ("B", DATE, "10:00"),
+        ("B", DATE, "10:30"), ("A", DATE, "10:45"), ("A", DATE, "11:00"),
+    ]
+
+    # Monday's slots run out, so the search moves on to Tuesday
+    r = client.get("/slots/next", params={"date": DATE, "time": "11:30", "limit": 4, "service": "Haircut"})
+    assert found(r) == [("A", DATE, "11:30"), ("B", DATE, "11:30"),
+                        ("C", "2026-02-03", "09:00"), ("C", "2026-02-03", "09:30")]
+
+    r = client.get("/slots/next", params={"date": DATE, "time": "09:00", "limit": 2, "checked_in": True})
+    assert found(r) == [("B", DATE, "10:00"), ("B", DATE, "10:30")]
+
+
+def test_next_available_only_loads_the_days_it_reaches(client, session):
+    add_barbers(session)
+    queries = []
+    listener = lambda *args: queries.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        r = client.get("/slots/next", params={"date": DATE, "time": "09:00", "limit": 3})
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert len(r.json()) == 3
+    # Barbers, the schedule (shifts + overrides, once), then one Appointment
+    # query per day reached, for all barbers at once: Monday, and Tuesday
+    # because C has no Monday shift
+    assert len(queries) == 5
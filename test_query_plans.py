@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from backend.auth import create_access_token, get_password_hash
+from backend.availability import availability_index
+from backend.database import engine
+from backend.models import Appointment, Barber, Shift
+
+
+def seed(session):
+    pwd = get_password_hash("password")
+    barbers = [Barber(name=f"B{i}", username=f"b{i}", hashed_password=pwd) for i in range(3)]
+    session.add_all(barbers)
+    session.commit()
+    for barber in barbers:
+        session.add_all([Shift(barber_id=barber.id, weekday=d, start_hour=9, end_hour=17) for d in range(7)])
+        start = datetime.now().replace(hour=9, minute=0, second=0, microsecond=0) - timedelta(days=30)
+        session.add_all([
+            Appointment(barber_id=barber.id, customer_name="C", time_slot=start + timedelta(days=d))
+            for d in range(60)
+        ])
+    session.commit()
+    return barbers
+
+
+def captured_selects(client, session):
+    barbers = seed(session)
+    token = create_access_token({"sub": barbers[0].username})
+    today = datetime.now().strftime("%Y-%m-%d")
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        availability_index.clear()
+        client.get("/slots", params={"barber_id": barbers[0].id, "date": today})
+        availability_index.clear()
+        client.get("/slots/bulk", params={"start_date": today, "end_date": today, "barber_ids": [barbers[1].id]})
+        client.get("/barber/dashboard-stats", headers={"Authorization": f"Bearer {token}"})
+        client.post("/shifts", json={"barber_id": barbers[0].id, "weekday": 0, "start_hour": 10, "end_hour": 18})
+        client.post("/login", data={"username": "b0", "password": "wrong"})
+        before = len(statements)
+        cursor = client.get("/appointments", params={"limit": 5}).headers["x-next-cursor"]
+        del statements[before:]  # the first page is a LIMITed walk of the time_slot index
+        client.get("/appointments", params={"limit": 5, "cursor": cursor})
+        client.get("/appointments", params={"barber_id": barbers[1].id, "start_date": today, "cursor": cursor})
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    return statements
+
+
+def test_hot_queries_use_indexes(client, session):
+    statements = captured_selects(client, session)
+    assert len(statements) >= 6
+
+    with engine.connect() as conn:
+        raw = conn.connection.dbapi_connection
+        for statement, parameters in statements:
+            if "WHERE" not in statement:
+                continue  # whole-table loads (the compiled shift schedule) scan by design
+            plan = raw.execute("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+            details = [row[-1] for row in plan]
+            scans = [d for d in details if d.startswith("SCAN")]
+            assert not scans, f"{statement!r} falls back to a scan: {details}"
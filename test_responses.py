@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+from backend.auth import create_access_token
+from backend.models import Barber
+
+
+def test_barber_payloads_are_lean_and_cached_list_follows_changes(client, session):
+    session.add(Barber(name="Test", username="test", hashed_password="secret-hash", photo_url="p.png"))
+    session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'test'}, timedelta(minutes=5))}"}
+
+    barbers = client.get("/barbers")
+    assert barbers.headers["content-type"] == "application/json" and "etag" in barbers.headers
+    assert barbers.json() == [{"id": 1, "name": "Test", "photo_url": "p.png", "is_checked_in": False}]
+
+    me = client.get("/users/me", headers=headers).json()
+    assert "hashed_password" not in me and me["username"] == "test" and me["role"] == "barber"
+
+    client.post("/barber/toggle-status", headers=headers)
+    assert client.get("/barbers").json()[0]["is_checked_in"] is True
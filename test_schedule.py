@@ -0,0 +1,89 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import select
+
+from backend.database import engine
+from backend.models import Shift, ShiftOverride
+from backend.schedule import BarberSchedule, hour_windows, shift_schedule
+from conftest import DATE
+
+
+@pytest.fixture
+def barber_id(session, barber):
+    # The test barber, working 9-12 every day of the week
+    session.add_all([Shift(barber_id=barber.id, weekday=d, start_hour=9, end_hour=12) for d in range(1, 7)])
+    session.commit()
+    return barber.id
+
+
+def slots(client, barber_id, day=DATE):
+    return client.get("/slots", params={"barber_id": barber_id, "date": day}).json()
+
+
+def test_overrides_paint_over_weekly_hours():
+    weekly = [hour_windows([(9, 17)])] * 7
+    schedule = BarberSchedule(weekly, [
+        (1, date(2026, 2, 1), date(2026, 2, 10), ()),                       # holiday
+        (2, date(2026, 2, 5), date(2026, 2, 5), hour_windows([(10, 12)])),  # newer: one day back in
+    ])
+    assert schedule.windows(date(2026, 1, 31)) == ((540, 1020),)
+    assert schedule.windows(date(2026, 2, 4)) == ()
+    assert schedule.windows(date(2026, 2, 5)) == ((600, 720),)
+    assert schedule.windows(date(2026, 2, 6)) == ()
+    assert schedule.windows(date(2026, 2, 11)) == ((540, 1020),)
+    assert schedule.without_override(1).windows(date(2026, 2, 4)) == ((540, 1020),)
+
+
+def test_split_shifts_and_overrides_update_cached_slots(client, session, barber_id):
+    client.post("/book", params={"barber_id": barber_id, "date": DATE, "time": "09:00", "name": "A"})
+    assert slots(client, barber_id) == ["09:30", "10:00", "10:30", "11:00", "11:30"]
+
+    r = client.put(f"/shifts/{barber_id}/0", json=[[13, 15], [9, 11]])
+    assert r.status_code == 200
+    assert slots(client, barber_id) == ["09:30", "10:00", "10:30", "13:00", "13:30", "14:00", "14:30"]
+    assert client.put(f"/shifts/{barber_id}/0", json=[[9, 12], [11, 14]]).status_code == 400
+
+    # Sick from Monday to Wednesday, then back for a short Tuesday afternoon
+    sick = client.post("/shifts/overrides", json={"barber_id": barber_id, "start_date": DATE, "end_date": "2026-02-04"})
+    client.post("/shifts/overrides", json={"barber_id": barber_id, "start_date": "2026-02-03",
+                                           "end_date": "2026-02-03", "hours": [[14, 15]]})
+    assert slots(client, barber_id) == []
+    assert slots(client, barber_id, "2026-02-03") == ["14:00", "14:30"]
+    assert slots(client, barber_id, "2026-02-04") == []
+    assert slots(client, barber_id, "2026-02-05") == ["09:00", "09:30", "10:00", "10:30", "11:00", "11:30"]
+
+    # Removing the sick days brings the weekly hours (and Monday's booking) back
+    client.delete(f"/shifts/overrides/{sick.json()['id']}")
+    assert slots(client, barber_id)[:2] == ["09:30", "10:00"]
+    assert slots(client, barber_id, "2026-02-04")[0] == "09:00"
+
+
+def test_schedule_is_loaded_once(client, session, barber_id):
+    queries = []
+    listener = lambda *args: queries.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        for day in ("2026-02-02", "2026-02-03", "2026-02-04"):
+            slots(client, barber_id, day)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    # Shifts and overrides once, then only each day's appointments
+    assert sum(q.endswith("FROM shift") for q in queries) == 1
+    assert sum(q.endswith("FROM shiftoverride") for q in queries) == 1
+
+
+def test_invalid_shifts_are_rejected_before_writing(client, session, barber_id):
+    assert client.post("/shifts", json={"barber_id": barber_id, "weekday": 7, "start_hour": 9, "end_hour": 12}).status_code == 400
+    assert client.post("/shifts", json={"barber_id": barber_id, "weekday": 0, "start_hour": 9, "end_hour": 30}).status_code == 400
+    assert client.put(f"/shifts/{barber_id}/7", json=[[9, 12]]).status_code == 400
+    assert len(session.exec(select(Shift)).all()) == 7
+
+    # A bad row already in the database is skipped, not fatal for every barber
+    session.add(Shift(barber_id=barber_id, weekday=9, start_hour=9, end_hour=12))
+    session.add(ShiftOverride(barber_id=barber_id, start_date=date(2026, 2, 3), end_date=date(2026, 2, 3), hours="x"))
+    session.commit()
+    shift_schedule.clear()
+    assert slots(client, barber_id)[0] == "09:00"
+    assert slots(client, barber_id, "2026-02-03")[0] == "09:00"
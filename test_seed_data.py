@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+from sqlmodel import func, select
+
+from backend.models import Appointment, Barber, DailyStats, Shift
+from backend.seed_data import bulk_seed
+from backend.services import SERVICES
+
+
+def test_bulk_seed_is_consistent(session, client):
+    bulk_seed(barbers=4, months=1, future_days=7, pattern="mixed", seed=1)
+
+    assert session.exec(select(func.count()).select_from(Barber)).one() == 4
+    assert session.exec(select(func.count()).select_from(Shift)).one() > 0
+    appointments = session.exec(select(func.count()).select_from(Appointment)).one()
+    assert appointments > 100
+    assert session.exec(select(func.sum(DailyStats.bookings))).one() == appointments
+    assert client.get("/admin/stats").json()["total_bookings"] == appointments
+    assert client.get("/admin/stats").json()["revenue"] == sum(
+        SERVICES[service].price for service in session.exec(select(Appointment.service_type)).all()
+    )
+
+    # Appointments fit inside each barber's shifts and never overlap
+    shifts = {(s.barber_id, s.weekday): s for s in session.exec(select(Shift)).all()}
+    previous_end = {}
+    for appt in session.exec(select(Appointment).order_by(Appointment.barber_id, Appointment.time_slot)).all():
+        shift = shifts[(appt.barber_id, appt.time_slot.weekday())]
+        end = appt.time_slot + timedelta(minutes=SERVICES[appt.service_type].minutes)
+        assert shift.start_hour <= appt.time_slot.hour and end <= appt.time_slot.replace(hour=shift.end_hour, minute=0)
+        assert previous_end.get(appt.barber_id, appt.time_slot) <= appt.time_slot
+        previous_end[appt.barber_id] = end
+
+    bulk_seed(barbers=4, months=1)  # refuses to seed a non-empty database
+    assert session.exec(select(func.count()).select_from(Barber)).one() == 4
+
+
+def test_bulk_seed_without_appointments(session):
+    bulk_seed(barbers=2, months=1, future_days=0, fill_rate=0, seed=1)
+    assert session.exec(select(func.count()).select_from(Barber)).one() == 2
+    assert session.exec(select(func.count()).select_from(DailyStats)).one() == 0
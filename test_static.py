@@ -0,0 +1,37 @@
+import re
+from datetime import datetime, timedelta
+
+from backend.models import Appointment, Barber
+
+
+def test_static_assets_are_precompressed_and_versioned(client):
+    page = client.get("/static/index.html", headers={"Accept-Encoding": "gzip"})
+    assert page.headers["content-encoding"] == "gzip" and "Accept-Encoding" in page.headers["vary"]
+    assert page.headers["cache-control"] == "public, no-cache"
+    assert client.get("/static/index.html", headers={"If-None-Match": page.headers["etag"],
+                                                       "Accept-Encoding": "gzip"}).status_code == 304
+
+    # The page links a content-hashed URL, which can be cached for good
+    css_url = re.search(r'href="(style\.css\?v=\w+)"', page.text).group(1)
+    css = client.get(f"/static/{css_url}", headers={"Accept-Encoding": "br;q=0, gzip"})
+    assert css.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert css.headers["content-encoding"] == "gzip"
+
+    plain = client.get("/static/style.css", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers and plain.text == css.text
+    assert plain.headers["etag"] != css.headers["etag"]
+    assert plain.headers["cache-control"] == "public, no-cache"
+
+
+def test_large_json_is_gzipped(client, session):
+    barber = Barber(name="Test", username="test", hashed_password="x")
+    session.add(barber)
+    session.commit()
+    start = datetime(2026, 2, 2, 9)
+    session.add_all([Appointment(barber_id=barber.id, customer_name=f"C{i}", time_slot=start + timedelta(hours=i))
+                     for i in range(50)])
+    session.commit()
+
+    r = client.get("/appointments", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip" and len(r.json()) == 50
+    assert "content-encoding" not in client.get("/services", headers={"Accept-Encoding": "gzip"}).headers
@@ -0,0 +1,53 @@
+from datetime import datetime
+
+from sqlmodel import select
+
+from backend.models import Appointment, Barber, DailyStats
+from backend.stats import backfill_daily_stats
+
+
+def add_barbers(session, n=2):
+    barbers = [Barber(name=f"B{i}", username=f"b{i}", hashed_password="x") for i in range(n)]
+    session.add_all(barbers)
+    session.commit()
+    return [b.id for b in barbers]
+
+
+def book(client, barber_id, date, time):
+    return client.post("/book", params={"barber_id": barber_id, "date": date, "time": time, "name": "C"})
+
+
+def test_rollup_follows_bookings_and_cancellations(client, session):
+    b1, b2 = add_barbers(session)
+    book(client, b1, "2026-02-02", "10:00")
+    book(client, b1, "2026-02-03", "10:00")
+    book(client, b2, "2026-02-03", "11:00")
+    book(client, b2, "2026-02-03", "11:00")  # rejected double booking
+
+    stats = client.get("/admin/stats").json()
+    assert stats == {"total_bookings": 3, "revenue": 75, "active_barbers": 2}
+
+    stats = client.get("/admin/stats", params={"start_date": "2026-02-03", "by_barber": True}).json()
+    assert stats["total_bookings"] == 2
+    assert stats["barbers"] == [
+        {"barber_id": b1, "bookings": 1, "revenue": 25},
+        {"barber_id": b2, "bookings": 1, "revenue": 25},
+    ]
+
+    appt = session.exec(select(Appointment).where(Appointment.barber_id == b2)).one()
+    client.delete(f"/appointments/{appt.id}")
+    stats = client.get("/admin/stats", params={"start_date": "2026-02-03", "end_date": "2026-02-03"}).json()
+    assert stats["total_bookings"] == 1 and stats["revenue"] == 25
+
+
+def test_backfill_from_existing_appointments(session):
+    (b1,) = add_barbers(session, 1)
+    session.add_all([
+        Appointment(barber_id=b1, customer_name="C", time_slot=datetime(2026, 2, 2, h))
+        for h in (9, 10, 11)
+    ])
+    session.commit()
+
+    backfill_daily_stats(session)
+    row = session.exec(select(DailyStats)).one()
+    assert (row.day.isoformat(), row.bookings, row.revenue) == ("2026-02-02", 3, 75)
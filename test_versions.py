@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+
+from sqlmodel import select
+
+from backend.auth import create_access_token
+from backend.models import Appointment
+from conftest import DATE
+
+
+def etag(client, path, **params):
+    r = client.get(path, params=params)
+    assert r.status_code == 200
+    return r.headers["etag"]
+
+
+def test_each_write_bumps_the_right_versions(client, session, barber):
+    slots = {"barber_id": barber.id, "date": DATE}
+    other_day = {"barber_id": barber.id, "date": "2026-02-03"}
+
+    def tags():
+        return {
+            "barbers": etag(client, "/barbers"),
+            "slots": etag(client, "/slots", **slots),
+            "other_day": etag(client, "/slots", **other_day),
+            "appointments": etag(client, "/appointments"),
+        }
+
+    def changed(before, after):
+        return {name for name in before if before[name] != after[name]}
+
+    t0 = tags()
+    assert tags() == t0
+
+    client.post("/book", params={**slots, "time": "10:00", "name": "A"})
+    t1 = tags()
+    assert changed(t0, t1) == {"slots", "appointments"}
+
+    appt_id = session.exec(select(Appointment.id)).one()
+    client.delete(f"/appointments/{appt_id}")
+    t2 = tags()
+    assert changed(t1, t2) == {"slots", "appointments"}
+
+    client.post("/shifts", json={"barber_id": barber.id, "weekday": 0, "start_hour": 9, "end_hour": 12})
+    t3 = tags()
+    assert changed(t2, t3) == {"slots", "other_day"}
+
+    hold = client.post("/slots/hold", params={**slots, "time": "09:00"}).json()
+    t4 = tags()
+    assert changed(t3, t4) == {"slots"}
+    client.delete(f"/slots/hold/{hold['hold_id']}")
+    assert tags()["slots"] == t3["slots"]
+
+    token = create_access_token({"sub": "test"}, expires_delta=timedelta(minutes=5))
+    client.post("/barber/toggle-status", headers={"Authorization": f"Bearer {token}"})
+    t5 = tags()
+    assert changed(t3, t5) == {"barbers"}
+
+
+def test_conditional_requests_get_304(client, session):
+    r = client.get("/barbers")
+    assert r.headers["cache-control"] == "public, no-cache"
+    assert "last-modified" in r.headers
+
+    r304 = client.get("/barbers", headers={"If-None-Match": r.headers["etag"]})
+    assert r304.status_code == 304 and r304.content == b""
+    assert client.get("/barbers", headers={"If-None-Match": '"stale"'}).status_code == 200
+
+    r = client.get("/slots", params={"barber_id": 1, "date": DATE})
+    assert r.headers["cache-control"] == "public, no-cache"
+    assert client.get("/slots", params={"barber_id": 1, "date": DATE},
+                      headers={"If-None-Match": r.headers["etag"]}).status_code == 304
+    assert client.get("/appointments", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"}).status_code == 304
+
+
+def test_compressed_json_has_a_weak_tag_and_304s_vary(client, session, barber):
+    session.add_all([Appointment(barber_id=barber.id, customer_name=f"C{i}", time_slot=datetime(2026, 2, 2, 9) + timedelta(minutes=30 * i))
+                     for i in range(40)])
+    session.commit()
+
+    r = client.get("/appointments", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["content-encoding"] == "gzip" and r.headers["etag"].startswith('W/"')
+    r304 = client.get("/appointments", headers={"Accept-Encoding": "gzip", "If-None-Match": r.headers["etag"].removeprefix("W/")})
+    assert r304.status_code == 304 and "Accept-Encoding" in r304.headers["vary"]